@@ -2,187 +2,98 @@
 
 from __future__ import annotations
 
-from homeassistant.components.lawn_mower import LawnMowerActivity
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    ATTR_ENTITY_ID,
-    STATE_UNAVAILABLE,
-    STATE_UNKNOWN,
-    Platform,
-)
-from homeassistant.core import Event, EventStateChangedData, HomeAssistant, ServiceCall
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.util.dt import now, parse_datetime
-
-from .const import STATE_CHARGING
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+
+from .const import CONF_SIMULATOR, DOMAIN
+from .coordinator import RobbyConfigEntry, RobbyCoordinator
+from .history import async_remove_history
+from .protection import async_remove_protection
+from .simulator import RobbySimulator, SimulatorConfig
+from .stuck import RobbyStuckDetector
+from .transitions import RobbyCycleTracker
 
 _PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
     Platform.DATETIME,
     Platform.LAWN_MOWER,
+    Platform.SENSOR,
     Platform.SWITCH,
 ]
 
-_ROBBY_START_CHARGING_CYCLE_ENTITY_ID = "datetime.robby_start_charging_cycle"
-_ROBBY_END_CHARGING_CYCLE_ENTITY_ID = "datetime.robby_end_charging_cycle"
-_ROBBY_START_MOWING_CYCLE_ENTITY_ID = "datetime.robby_start_mowing_cycle"
-_ROBBY_END_MOWING_CYCLE_ENTITY_ID = "datetime.robby_end_mowing_cycle"
-_ROBBY_SWITCH_STUCK_ENTITY_ID = "switch.robby_stuck"
-
-type RobbyConfigEntry = ConfigEntry  # noqa: F821
-
 
 async def async_setup_entry(hass: HomeAssistant, entry: RobbyConfigEntry) -> bool:
     """Set up Robby from a config entry."""
-
-    await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
-
-    """Actions"""
-
-    def is_mowing() -> bool:
-        """Check if the Robby is mowing according to dts."""
-        start_dt = parse_datetime(hass.states.get(_ROBBY_START_MOWING_CYCLE_ENTITY_ID).state)
-        stop_dt = parse_datetime(hass.states.get(_ROBBY_END_MOWING_CYCLE_ENTITY_ID).state)
-
-        return start_dt > stop_dt
-
-    def is_charging() -> bool:
-        """Check if the Robby is charging according to dts."""
-        start_dt = parse_datetime(hass.states.get(_ROBBY_START_CHARGING_CYCLE_ENTITY_ID).state)
-        stop_dt = parse_datetime(hass.states.get(_ROBBY_END_CHARGING_CYCLE_ENTITY_ID).state)
-
-        return start_dt > stop_dt
-
-    async def start_charging() -> None:
-        """Start charging the Robby."""
-        await hass.services.async_call(
-            "datetime",
-            "set_value",
-            {
-                ATTR_ENTITY_ID: _ROBBY_START_CHARGING_CYCLE_ENTITY_ID,
-                "datetime": now().isoformat(),
-            },
-            blocking=False,
-        )
-
-    async def stop_charging() -> None:
-        """Stop charging the Robby."""
-        await hass.services.async_call(
-            "datetime",
-            "set_value",
-            {
-                ATTR_ENTITY_ID: _ROBBY_END_CHARGING_CYCLE_ENTITY_ID,
-                "datetime": now().isoformat(),
-            },
-            blocking=False,
-        )
-
-    async def start_mowing() -> None:
-        """Start mowing with the Robby."""
-        await hass.services.async_call(
-            "datetime",
-            "set_value",
-            {
-                ATTR_ENTITY_ID: _ROBBY_START_MOWING_CYCLE_ENTITY_ID,
-                "datetime": now().isoformat(),
-            },
-            blocking=False,
-        )
-
-    async def stop_mowing() -> None:
-        """Stop mowing with the Robby."""
-        await hass.services.async_call(
-            "datetime",
-            "set_value",
-            {
-                ATTR_ENTITY_ID: _ROBBY_END_MOWING_CYCLE_ENTITY_ID,
-                "datetime": now().isoformat(),
-            },
-            blocking=False,
-        )
-
-    async def getting_stuck() -> None:
-        """Handle the Robby getting stuck."""
-        await hass.services.async_call(
-            "homeassistant",
-            "turn_on",
-            {"entity_id": _ROBBY_SWITCH_STUCK_ENTITY_ID},
-            blocking=False,
+    coordinator = RobbyCoordinator(hass, entry)
+    if CONF_SIMULATOR in entry.data:
+        simulator = RobbySimulator(
+            hass,
+            coordinator.power_sensor,
+            coordinator.switch_entity,
+            SimulatorConfig.from_dict(entry.data[CONF_SIMULATOR]),
         )
+        simulator.async_start()
+        entry.async_on_unload(simulator.async_stop)
+    entry.runtime_data = coordinator
+    coordinator.async_setup()
 
-    async def released() -> None:
-        """Handle the Robby being released."""
-        await hass.services.async_call(
-            "homeassistant",
-            "turn_off",
-            {"entity_id": _ROBBY_SWITCH_STUCK_ENTITY_ID},
-            blocking=False,
-        )
+    await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
+    coordinator.async_index_entities()
+    await coordinator.protection.async_load()
 
-    async def async_handle_state_change(
-        event: Event[EventStateChangedData],
-    ) -> None:
-        """Process state change event."""
-        data = event.data
-        old_state = (
-            data.get("old_state").state if data.get("old_state") is not None else None
-        )
-        new_state = (
-            data.get("new_state").state if data.get("new_state") is not None else None
+    tracker = RobbyCycleTracker(coordinator)
+    entry.async_on_unload(
+        coordinator.async_add_transition_listener(tracker.async_handle_transition)
+    )
+    stuck_detector = RobbyStuckDetector(coordinator)
+    entry.async_on_unload(
+        coordinator.async_add_transition_listener(
+            stuck_detector.async_handle_transition
         )
+    )
+    entry.async_on_unload(stuck_detector.async_stop)
 
-        print("Transition from", old_state, "to", new_state)
-
-        if old_state == new_state:
-            return
-
-        if old_state in (STATE_UNAVAILABLE, STATE_UNKNOWN) or new_state in (
-            STATE_UNAVAILABLE,
-            STATE_UNKNOWN,
-        ):
-            # Handle unavailable or unknown state
-            return
-
-        # Handle other state changes
-        if old_state == LawnMowerActivity.DOCKED:
-            if new_state == LawnMowerActivity.MOWING:
-                print("Started mowing after being dokced")
-                await start_mowing()
-            elif new_state == STATE_CHARGING:
-                print("Started charging")
-                await start_charging()
-        elif old_state == STATE_CHARGING:
-            await stop_charging()
-            if new_state == LawnMowerActivity.MOWING:
-                await start_mowing()
-                print("Finished charging and started mowing")
-            if new_state == LawnMowerActivity.DOCKED:
-                print("Finished charging")
-        elif old_state in (LawnMowerActivity.MOWING, LawnMowerActivity.ERROR):
-            if new_state == LawnMowerActivity.DOCKED:
-                print("Finished mowing and returned to dock without charging")
-                if is_mowing():
-                      await stop_mowing()
-                await released()
-            elif new_state == STATE_CHARGING:
-                print("Finished mowing, returned to dock and started charging")
-                if is_mowing():
-                    await stop_mowing()
-                await released()
-                if not is_charging():
-                    await start_charging()
+    # The restored cycles are reconciled before any new state change arrives.
+    tracker.async_start()
+    coordinator.async_start()
+    stuck_detector.async_start()
+    coordinator.planner.async_start()
+    coordinator.statistics.async_start()
+    coordinator.protection.async_start()
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     entry.async_on_unload(
-        async_track_state_change_event(
-            hass,
-            "lawn_mower.robby",
-            async_handle_state_change,
-        )
+        entry.add_update_listener(stuck_detector.async_update_options)
+    )
+    entry.async_on_unload(
+        entry.add_update_listener(coordinator.planner.async_update_options)
+    )
+    entry.async_on_unload(
+        entry.add_update_listener(coordinator.protection.async_update_options)
+    )
+
+    entry.async_create_background_task(
+        hass, coordinator.async_load_aggregates(), "robby_load_aggregates"
     )
 
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: RobbyConfigEntry
+) -> None:
+    """Apply changed options without reloading the entry."""
+    entry.runtime_data.async_update_options()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: RobbyConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: RobbyConfigEntry) -> None:
+    """Remove the stored data of a config entry."""
+    await async_remove_history(hass, entry.entry_id)
+    await async_remove_protection(hass, entry.entry_id)
+    ir.async_delete_issue(hass, DOMAIN, f"session_anomaly_{entry.entry_id}")
@@ -0,0 +1,102 @@
+"""Rolling session aggregates for the Robby integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import time
+
+from .const import AGGREGATE_WINDOW_HOURS
+from .history import SESSION_MOWING, RobbySession
+
+
+@dataclass(slots=True)
+class SessionTotals:
+    """Totals of the sessions within a window."""
+
+    mowing_time: float = 0.0
+    mowing_sessions: int = 0
+    charging_time: float = 0.0
+    charging_sessions: int = 0
+
+    @property
+    def average_mowing_time(self) -> float | None:
+        """Return the average duration of a mowing session in seconds."""
+        if not self.mowing_sessions:
+            return None
+        return self.mowing_time / self.mowing_sessions
+
+    @property
+    def charge_to_mow_ratio(self) -> float | None:
+        """Return the charging time per unit of mowing time."""
+        if not self.mowing_time:
+            return None
+        return self.charging_time / self.mowing_time
+
+    def add(self, other: SessionTotals) -> None:
+        """Add the totals of another window."""
+        self.mowing_time += other.mowing_time
+        self.mowing_sessions += other.mowing_sessions
+        self.charging_time += other.charging_time
+        self.charging_sessions += other.charging_sessions
+
+
+class RobbySessionAggregates:
+    """Aggregate closed sessions into hourly buckets.
+
+    Only the buckets of the last week are kept, and the daily and weekly
+    totals are recomputed when a session is added or a bucket expires rather
+    than when read.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregates."""
+        self.day = SessionTotals()
+        self.week = SessionTotals()
+        self._buckets: dict[int, SessionTotals] = {}
+        self._hour = 0
+
+    @property
+    def next_expiry(self) -> float | None:
+        """Return when the oldest bucket leaves the daily or weekly totals."""
+        expiries = [
+            expiry
+            for start in self._buckets
+            for expiry in (start + 24, start + AGGREGATE_WINDOW_HOURS)
+            if expiry > self._hour
+        ]
+        return min(expiries) * 3600 if expiries else None
+
+    def add_sessions(self, sessions: Iterable[RobbySession]) -> None:
+        """Add closed sessions and refresh the totals."""
+        hour = int(time.time() // 3600)
+        for session in sessions:
+            end_hour = int(session.end.timestamp() // 3600)
+            if end_hour <= hour - AGGREGATE_WINDOW_HOURS:
+                continue
+            totals = self._buckets.setdefault(end_hour, SessionTotals())
+            duration = session.duration.total_seconds()
+            if session.kind == SESSION_MOWING:
+                totals.mowing_time += duration
+                totals.mowing_sessions += 1
+            else:
+                totals.charging_time += duration
+                totals.charging_sessions += 1
+        self._refresh(hour)
+
+    def refresh(self) -> None:
+        """Drop the expired buckets from the totals."""
+        self._refresh(int(time.time() // 3600))
+
+    def _refresh(self, hour: int) -> None:
+        """Drop expired buckets and recompute the daily and weekly totals."""
+        self._hour = hour
+        self.day = SessionTotals()
+        self.week = SessionTotals()
+        for start in list(self._buckets):
+            if start <= hour - AGGREGATE_WINDOW_HOURS:
+                del self._buckets[start]
+                continue
+            self.week.add(self._buckets[start])
+            if start > hour - 24:
+                self.day.add(self._buckets[start])
@@ -0,0 +1,97 @@
+"""Session anomaly detection for the Robby integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import math
+
+from .const import ANOMALY_MIN_SESSIONS, ANOMALY_THRESHOLD
+from .history import OUTCOME_COMPLETED, SESSION_CHARGING, SESSION_MOWING, RobbySession
+
+METRIC_MOWING_DURATION = "mowing_duration"
+METRIC_CHARGING_DURATION = "charging_duration"
+METRIC_CHARGE_ENERGY = "charge_energy"
+
+
+@dataclass(slots=True)
+class RunningStats:
+    """Mean and variance of a series, updated with Welford's algorithm."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Return the sample standard deviation."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def add(self, value: float) -> None:
+        """Add a value to the series."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def deviation(self, value: float) -> float | None:
+        """Return how many standard deviations a value is from the mean."""
+        if self.count < ANOMALY_MIN_SESSIONS or not (stddev := self.stddev):
+            return None
+        return (value - self.mean) / stddev
+
+
+def _metrics(session: RobbySession) -> dict[str, float]:
+    """Return the tracked metrics of a completed session."""
+    if session.outcome != OUTCOME_COMPLETED:
+        return {}
+    duration = session.duration.total_seconds()
+    if session.kind == SESSION_MOWING:
+        return {METRIC_MOWING_DURATION: duration}
+    if session.kind == SESSION_CHARGING:
+        metrics = {METRIC_CHARGING_DURATION: duration}
+        if session.energy:
+            metrics[METRIC_CHARGE_ENERGY] = session.energy
+        return metrics
+    return {}
+
+
+class RobbyAnomalyDetector:
+    """Flag completed sessions that deviate from the previous ones.
+
+    Each metric keeps only its running mean and variance, and a session is
+    compared before it is added, so a single outlier cannot hide itself.
+    A metric stays anomalous until its next session is normal again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the detector."""
+        self.stats: dict[str, RunningStats] = {}
+        self.anomalies: dict[str, float] = {}
+        self.seed(())
+
+    def seed(self, sessions: Iterable[RobbySession]) -> None:
+        """Learn from the history of closed sessions without checking them."""
+        self.stats = {
+            METRIC_MOWING_DURATION: RunningStats(),
+            METRIC_CHARGING_DURATION: RunningStats(),
+            METRIC_CHARGE_ENERGY: RunningStats(),
+        }
+        for session in sessions:
+            for metric, value in _metrics(session).items():
+                self.stats[metric].add(value)
+
+    def check_session(self, session: RobbySession) -> bool:
+        """Check and learn from a closed session, return if anomalies changed."""
+        old_anomalies = dict(self.anomalies)
+        for metric, value in _metrics(session).items():
+            stats = self.stats[metric]
+            deviation = stats.deviation(value)
+            if deviation is not None and abs(deviation) >= ANOMALY_THRESHOLD:
+                self.anomalies[metric] = round(deviation, 1)
+            else:
+                self.anomalies.pop(metric, None)
+            stats.add(value)
+        return self.anomalies != old_anomalies
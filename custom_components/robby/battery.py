@@ -0,0 +1,135 @@
+"""Battery level estimation for the Robby integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from statistics import median
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+
+from .const import (
+    BATTERY_PROFILE_SESSIONS,
+    BATTERY_RETURN_LEVEL,
+    BATTERY_TAPER_FRACTION,
+    BATTERY_TAPER_LEVEL,
+    STATE_CHARGING,
+)
+from .energy import ChargingEnergyMeter
+from .history import OUTCOME_COMPLETED, SESSION_CHARGING, SESSION_MOWING, RobbySession
+
+
+class RobbyChargeProfile:
+    """Learned charge profile of a Robby.
+
+    Only the energy of recent completed charging sessions and the duration of
+    recent completed mowing sessions are kept, as taken from the session
+    summaries.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profile."""
+        self._charge_energies: deque[float] = deque(maxlen=BATTERY_PROFILE_SESSIONS)
+        self._mowing_times: deque[float] = deque(maxlen=BATTERY_PROFILE_SESSIONS)
+
+    @property
+    def charge_energy(self) -> float | None:
+        """Return the energy in Wh to charge from the return level to full."""
+        return median(self._charge_energies) if self._charge_energies else None
+
+    @property
+    def mowing_time(self) -> float | None:
+        """Return the time in seconds to mow from full to the return level."""
+        return median(self._mowing_times) if self._mowing_times else None
+
+    def add_sessions(self, sessions: Iterable[RobbySession]) -> None:
+        """Learn from closed sessions."""
+        for session in sessions:
+            if session.outcome != OUTCOME_COMPLETED:
+                continue
+            if session.kind == SESSION_CHARGING and session.energy:
+                self._charge_energies.append(session.energy)
+            elif session.kind == SESSION_MOWING:
+                self._mowing_times.append(session.duration.total_seconds())
+
+
+class RobbyBatteryEstimator:
+    """Estimate the battery level from the activity and the charging power.
+
+    A Robby returns to the dock at the return level, so the level drains
+    linearly over the learned mowing time and fills with the charged energy
+    relative to the learned charge energy. Once the charging power tapers
+    off the battery is at least at the taper level, and a completed charge
+    is full. Every power sample is handled in constant time.
+    """
+
+    def __init__(self, energy: ChargingEnergyMeter) -> None:
+        """Initialize the estimator."""
+        self.energy = energy
+        self.profile = RobbyChargeProfile()
+        self.level: float | None = None
+        self.time_to_full: float | None = None
+        self._activity: str | None = None
+        self._anchor_level: float | None = None
+        self._anchor_time = 0.0
+        self._peak_power = 0.0
+
+    def update(self, activity: str, power: float, timestamp: float) -> None:
+        """Update the estimate with the current activity and power."""
+        if activity != self._activity:
+            self._transition(activity, timestamp)
+
+        if activity == LawnMowerActivity.MOWING:
+            self._drain(timestamp)
+        elif activity == STATE_CHARGING:
+            self._charge(power)
+
+    def _transition(self, activity: str, timestamp: float) -> None:
+        """Anchor the estimate at the start of an activity."""
+        if self._activity == STATE_CHARGING and activity == LawnMowerActivity.DOCKED:
+            self.level = 100.0
+        elif activity == STATE_CHARGING and (
+            self.level is None or self._activity == LawnMowerActivity.MOWING
+        ):
+            # A Robby that comes back from mowing has drained to about the
+            # return level, whatever the drain estimate says.
+            self.level = min(
+                BATTERY_RETURN_LEVEL if self.level is None else self.level,
+                BATTERY_RETURN_LEVEL,
+            )
+
+        self._activity = activity
+        self._anchor_level = self.level
+        self._anchor_time = timestamp
+        self._peak_power = 0.0
+        self.time_to_full = None
+
+    def _drain(self, timestamp: float) -> None:
+        """Drain the battery over the learned mowing time."""
+        if self._anchor_level is None or not (mowing_time := self.profile.mowing_time):
+            return
+        drained = (timestamp - self._anchor_time) / mowing_time
+        self.level = max(
+            self._anchor_level - drained * (100 - BATTERY_RETURN_LEVEL), 0.0
+        )
+
+    def _charge(self, power: float) -> None:
+        """Fill the battery with the charged energy."""
+        if self._anchor_level is None or not (
+            charge_energy := self.profile.charge_energy
+        ):
+            return
+        self._peak_power = max(self._peak_power, power)
+        level = self._anchor_level + self.energy.session_energy / charge_energy * (
+            100 - BATTERY_RETURN_LEVEL
+        )
+        if power < self._peak_power * BATTERY_TAPER_FRACTION:
+            level = max(level, BATTERY_TAPER_LEVEL)
+        # Only the end of the charging session tells the battery is full.
+        self.level = min(level, 99.0)
+
+        if average_power := self.energy.average_power:
+            remaining = (100 - self.level) / (100 - BATTERY_RETURN_LEVEL) * (
+                charge_energy
+            )
+            self.time_to_full = remaining / average_power * 3600
@@ -4,14 +4,11 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
-from homeassistant.const import STATE_ON, STATE_UNAVAILABLE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
 
 from . import RobbyConfigEntry
-from .const import CONF_POWER_SENSOR, CONF_SWITCH_SENSOR
-from .device_binding import get_device_info
+from .const import CONF_POWER_SENSOR, CONF_SWITCH_SENSOR, KEY_CHARGING, KEY_PROBLEM
 
 
 async def async_setup_entry(
@@ -21,71 +18,102 @@ async def async_setup_entry(
 ) -> None:
     """Set up the binary sensor entity."""
     charging = RobbyChargingBinarySensorEntity(hass, entry)
-    async_add_entities([charging], update_before_add=True)
+    problem = RobbyProblemBinarySensorEntity(hass, entry)
+    async_add_entities([charging, problem])
 
 
 class RobbyChargingBinarySensorEntity(BinarySensorEntity):
     """Representation of a Robby charging binary sensor."""
 
+    _attr_should_poll = False
+
     def __init__(self, hass: HomeAssistant, entry: RobbyConfigEntry) -> None:
         """Initialize the charging binary sensor entity."""
         self.hass = hass
+        self.coordinator = entry.runtime_data
         self._power_sensor = entry.data[CONF_POWER_SENSOR]
         self._switch_entity = entry.data[CONF_SWITCH_SENSOR]
         self._attr_name = "Robby charging"
         self._attr_unique_id = (
-            f"robby_charging_binary_sensor_{self._power_sensor}_{self._switch_entity}"
+            f"{KEY_CHARGING}_{self._power_sensor}_{self._switch_entity}"
         )
-        self._power_val = 0
-        self._switch_state = False
-        self._stuck_state = False
-        self._power_available = False
-        self._switch_available = False
         self._attr_device_class = BinarySensorDeviceClass.BATTERY_CHARGING
-        self.device_info = get_device_info(hass, entry)
+        self._attr_device_info = self.coordinator.device_info
+        self._async_update_attrs()
 
-        async_track_state_change_event(
-            hass,
-            [self._power_sensor, self._switch_entity],
-            self._handle_state_change,
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the coordinator when added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
         )
 
-    async def _handle_state_change(self, event):
-        await self.async_update_ha_state(True)
-
-    async def async_update_power(self):
-        """Update the power state of the binary sensor."""
-        if (power_state := self.hass.states.get(self._power_sensor)) is None:
-            self._power_available = False
-            return
-        self._power_available = power_state.state != STATE_UNAVAILABLE
-        try:
-            self._power_val = float(power_state.state)
-        except (ValueError, TypeError, AttributeError):
-            self._power_val = -1
-
-    async def async_update_switch(self):
-        """Update the switch state of the binary sensor."""
-        if (switch_state := self.hass.states.get(self._switch_entity)) is None:
-            self._switch_available = False
-            return
-        self._switch_available = switch_state.state != STATE_UNAVAILABLE
-        self._switch_state = switch_state.state == STATE_ON
-
-    async def async_update(self):
-        """Update the state of the binary sensor based on power consumption."""
-        await self.async_update_power()
-        await self.async_update_switch()
-
-    @property
-    def is_on(self) -> bool | None:
-        """Return the current state of the binary sensor."""
-        return self._switch_state and self._power_val >= 3
-
-    @property
-    def available(self) -> bool:
-        """Return availability of binary sensor."""
-        return (
-            self._power_available
-            and self._switch_available
+    @callback
+    def _async_update_attrs(self) -> bool:
+        """Derive the state from the coordinator snapshot, return if it changed."""
+        data = self.coordinator.data
+        is_on = data.charging
+        available = data.power_available and data.switch_available
+        if is_on == self._attr_is_on and available == self._attr_available:
+            return False
+
+        self._attr_is_on = is_on
+        self._attr_available = available
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the derived state changed."""
+        if self._async_update_attrs():
+            self.async_write_ha_state()
+            self.coordinator.metrics.state_writes += 1
+
+
+class RobbyProblemBinarySensorEntity(BinarySensorEntity):
+    """Representation of a Robby binary sensor for anomalous sessions."""
+
+    _attr_should_poll = False
+
+    def __init__(self, hass: HomeAssistant, entry: RobbyConfigEntry) -> None:
+        """Initialize the problem binary sensor entity."""
+        self.hass = hass
+        self.coordinator = entry.runtime_data
+        self._power_sensor = entry.data[CONF_POWER_SENSOR]
+        self._switch_entity = entry.data[CONF_SWITCH_SENSOR]
+        self._attr_name = "Robby problem"
+        self._attr_unique_id = (
+            f"{KEY_PROBLEM}_{self._power_sensor}_{self._switch_entity}"
+        )
+        self._attr_device_class = BinarySensorDeviceClass.PROBLEM
+        self._attr_device_info = self.coordinator.device_info
+        self._async_update_attrs()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to closed sessions when added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_session_listener(
+                self._handle_coordinator_update
+            )
         )
+
+    @callback
+    def _async_update_attrs(self) -> bool:
+        """Derive the state from the anomalies, return if it changed."""
+        anomalies = dict(self.coordinator.anomalies.anomalies)
+        if (
+            bool(anomalies) == self._attr_is_on
+            and anomalies == self.extra_state_attributes
+        ):
+            return False
+
+        self._attr_is_on = bool(anomalies)
+        self._attr_extra_state_attributes = anomalies
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the derived state changed."""
+        if self._async_update_attrs():
+            self.async_write_ha_state()
+            self.coordinator.metrics.state_writes += 1
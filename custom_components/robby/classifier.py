@@ -0,0 +1,148 @@
+"""Power signal classification for the Robby integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+
+from .const import (
+    CONF_CHARGING_MIN_POWER,
+    CONF_HYSTERESIS,
+    CONF_MOWING_MAX_POWER,
+    CONF_SAMPLE_WINDOW,
+    DEFAULT_CHARGING_MIN_POWER,
+    DEFAULT_DWELL_TIME,
+    DEFAULT_DWELL_TIMES,
+    DEFAULT_HYSTERESIS,
+    DEFAULT_MOWING_MAX_POWER,
+    DEFAULT_SAMPLE_WINDOW,
+    DWELL_TIME_OPTIONS,
+    STATE_CHARGING,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ClassifierConfig:
+    """Thresholds and timing used to classify the power signal."""
+
+    mowing_max_power: float = DEFAULT_MOWING_MAX_POWER
+    charging_min_power: float = DEFAULT_CHARGING_MIN_POWER
+    hysteresis: float = DEFAULT_HYSTERESIS
+    sample_window: int = DEFAULT_SAMPLE_WINDOW
+    dwell_times: Mapping[str, float] = field(
+        default_factory=lambda: dict(DEFAULT_DWELL_TIMES)
+    )
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> ClassifierConfig:
+        """Create the configuration from the options of a config entry."""
+        return cls(
+            mowing_max_power=options.get(
+                CONF_MOWING_MAX_POWER, DEFAULT_MOWING_MAX_POWER
+            ),
+            charging_min_power=options.get(
+                CONF_CHARGING_MIN_POWER, DEFAULT_CHARGING_MIN_POWER
+            ),
+            hysteresis=options.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS),
+            sample_window=int(options.get(CONF_SAMPLE_WINDOW, DEFAULT_SAMPLE_WINDOW)),
+            dwell_times={
+                activity: options.get(option, DEFAULT_DWELL_TIME)
+                for activity, option in DWELL_TIME_OPTIONS.items()
+            },
+        )
+
+
+class ActivityClassifier:
+    """Classify power samples into a stable activity.
+
+    Samples are kept in a small ring buffer and classified on their median.
+    The band of the current activity is widened by the hysteresis, and a new
+    activity is only adopted once it has been seen for its dwell time.
+    """
+
+    def __init__(self, config: ClassifierConfig) -> None:
+        """Initialize the classifier."""
+        self.config = config
+        self.activity: str | None = None
+        self.activity_since: float | None = None
+        self.pending: str | None = None
+        self.pending_since: float | None = None
+        self._last_class: str | None = None
+        self._samples: deque[float] = deque(maxlen=config.sample_window)
+
+    def reconfigure(self, config: ClassifierConfig) -> None:
+        """Apply new thresholds and timing, keeping the recent samples."""
+        self.config = config
+        self._samples = deque(self._samples, maxlen=config.sample_window)
+
+    def add_sample(self, power: float, timestamp: float) -> str | None:
+        """Add a power sample and return the stable activity."""
+        self._samples.append(power)
+        self._last_class = self._classify(power)
+        return self.evaluate(timestamp)
+
+    def crosses_boundary(self, power: float) -> bool:
+        """Return if a sample falls in another band than the previous sample."""
+        return self._classify(power) != self._last_class
+
+    def evaluate(self, timestamp: float) -> str | None:
+        """Promote a pending activity once it has been stable long enough."""
+        if not self._samples:
+            return self.activity
+
+        candidate = self._classify(sorted(self._samples)[len(self._samples) // 2])
+        if self.activity is None:
+            self.activity = candidate
+            self.activity_since = timestamp
+        elif candidate == self.activity:
+            self.pending = self.pending_since = None
+        elif candidate != self.pending:
+            self.pending = candidate
+            self.pending_since = timestamp
+
+        if (
+            self.pending is not None
+            and self.pending_since is not None
+            and timestamp - self.pending_since >= self._dwell_time(self.pending)
+        ):
+            self.activity = self.pending
+            self.activity_since = self.pending_since
+            self.pending = self.pending_since = None
+
+        return self.activity
+
+    @property
+    def next_evaluation(self) -> float | None:
+        """Return when the pending activity has been stable long enough."""
+        if self.pending is None or self.pending_since is None:
+            return None
+        return self.pending_since + self._dwell_time(self.pending)
+
+    def _dwell_time(self, activity: str) -> float:
+        """Return the minimum dwell time before adopting an activity."""
+        return self.config.dwell_times.get(activity, 0)
+
+    def _classify(self, power: float) -> str:
+        """Classify a power value, widening the band of the current activity."""
+        config = self.config
+        mowing_max = config.mowing_max_power
+        charging_min = config.charging_min_power
+        if self.activity == LawnMowerActivity.MOWING:
+            mowing_max += config.hysteresis
+        elif self.activity == LawnMowerActivity.DOCKED:
+            mowing_max -= config.hysteresis
+            charging_min += config.hysteresis
+        elif self.activity == STATE_CHARGING:
+            charging_min -= config.hysteresis
+
+        if power <= 0:
+            return LawnMowerActivity.ERROR
+        if power < mowing_max:
+            return LawnMowerActivity.MOWING
+        if power >= charging_min:
+            return STATE_CHARGING
+        return LawnMowerActivity.DOCKED
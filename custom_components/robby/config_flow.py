@@ -7,19 +7,86 @@ from typing import Any
 
 import voluptuous as vol
 
+from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
 from homeassistant.components.input_boolean import DOMAIN as INPUT_BOOLEAN_DOMAIN
 from homeassistant.components.input_number import DOMAIN as INPUT_NUMBER_DOMAIN
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
+from homeassistant.util import slugify
 
-from .const import CONF_POWER_SENSOR, CONF_SWITCH_SENSOR, DOMAIN
+from .const import (
+    CONF_CHARGING_DWELL_TIME,
+    CONF_CHARGING_MIN_POWER,
+    CONF_CHARGING_TIME,
+    CONF_DOCKED_DWELL_TIME,
+    CONF_DOCKED_TIME,
+    CONF_ERROR_DWELL_TIME,
+    CONF_HYSTERESIS,
+    CONF_IDLE_CUT_TIME,
+    CONF_MAX_MOWING_TIME,
+    CONF_MIN_TEMPERATURE,
+    CONF_MOWING_DWELL_TIME,
+    CONF_MOWING_MAX_POWER,
+    CONF_MOWING_TIME,
+    CONF_NOISE,
+    CONF_POWER_CUT,
+    CONF_POWER_SENSOR,
+    CONF_RAIN_SENSOR,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SAMPLE_WINDOW,
+    CONF_SAMPLES_PER_SECOND,
+    CONF_SCHEDULE_ENFORCE,
+    CONF_SIMULATOR,
+    CONF_SPEED_UP,
+    CONF_STUCK_POWER_TIME,
+    CONF_SWITCH_SENSOR,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_WEEKLY_MOWING_TIME,
+    CONF_WINDOW_END,
+    CONF_WINDOW_START,
+    DEFAULT_CHARGING_MIN_POWER,
+    DEFAULT_DWELL_TIME,
+    DEFAULT_HYSTERESIS,
+    DEFAULT_IDLE_CUT_TIME,
+    DEFAULT_MAX_MOWING_TIME,
+    DEFAULT_MIN_TEMPERATURE,
+    DEFAULT_MOWING_MAX_POWER,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SAMPLE_WINDOW,
+    DEFAULT_STUCK_POWER_TIME,
+    DEFAULT_WEEKLY_MOWING_TIME,
+    DEFAULT_WINDOW_END,
+    DEFAULT_WINDOW_START,
+    DOMAIN,
+)
+from .simulator import SimulatorConfig
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_DATA_SCHEMA = vol.Schema(
+
+def _number_selector(
+    maximum: float, step: float, unit: str | None = None
+) -> selector.NumberSelector:
+    """Return a number box selector."""
+    config = selector.NumberSelectorConfig(
+        min=0, max=maximum, step=step, mode=selector.NumberSelectorMode.BOX
+    )
+    # The selector only accepts a unit that is a string.
+    if unit is not None:
+        config["unit_of_measurement"] = unit
+    return selector.NumberSelector(config)
+
+
+STEP_ENTITIES_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_POWER_SENSOR): selector.EntitySelector(
             selector.EntitySelectorConfig(domain=[INPUT_NUMBER_DOMAIN, SENSOR_DOMAIN]),
@@ -27,14 +94,133 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_SWITCH_SENSOR): selector.EntitySelector(
             selector.EntitySelectorConfig(domain=[INPUT_BOOLEAN_DOMAIN, SWITCH_DOMAIN]),
         ),
+        vol.Optional(
+            CONF_SAMPLE_INTERVAL, default=DEFAULT_SAMPLE_INTERVAL
+        ): _number_selector(60, 0.5, "s"),
+    }
+)
+
+_SIMULATOR_DEFAULTS = SimulatorConfig()
+
+STEP_SIMULATOR_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME, default="Robby simulator"): selector.TextSelector(),
+        vol.Required(
+            CONF_SPEED_UP, default=_SIMULATOR_DEFAULTS.speed_up
+        ): _number_selector(10000, 1),
+        vol.Required(
+            CONF_SAMPLES_PER_SECOND, default=_SIMULATOR_DEFAULTS.samples_per_second
+        ): _number_selector(10000, 0.1),
+        vol.Required(
+            CONF_MOWING_TIME, default=_SIMULATOR_DEFAULTS.mowing_time
+        ): _number_selector(1440, 1, "min"),
+        vol.Required(
+            CONF_CHARGING_TIME, default=_SIMULATOR_DEFAULTS.charging_time
+        ): _number_selector(1440, 1, "min"),
+        vol.Required(
+            CONF_DOCKED_TIME, default=_SIMULATOR_DEFAULTS.docked_time
+        ): _number_selector(1440, 1, "min"),
+        vol.Required(CONF_NOISE, default=_SIMULATOR_DEFAULTS.noise): _number_selector(
+            10, 0.05, "W"
+        ),
+        vol.Optional(
+            CONF_SAMPLE_INTERVAL, default=DEFAULT_SAMPLE_INTERVAL
+        ): _number_selector(60, 0.5, "s"),
+    }
+)
+
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_MOWING_MAX_POWER, default=DEFAULT_MOWING_MAX_POWER
+        ): _number_selector(100, 0.1, "W"),
+        vol.Required(
+            CONF_CHARGING_MIN_POWER, default=DEFAULT_CHARGING_MIN_POWER
+        ): _number_selector(100, 0.1, "W"),
+        vol.Required(CONF_HYSTERESIS, default=DEFAULT_HYSTERESIS): _number_selector(
+            10, 0.05, "W"
+        ),
+        vol.Required(
+            CONF_SAMPLE_WINDOW, default=DEFAULT_SAMPLE_WINDOW
+        ): _number_selector(15, 1),
+        vol.Required(CONF_ERROR_DWELL_TIME, default=DEFAULT_DWELL_TIME): (
+            _number_selector(600, 1, "s")
+        ),
+        vol.Required(CONF_MOWING_DWELL_TIME, default=DEFAULT_DWELL_TIME): (
+            _number_selector(600, 1, "s")
+        ),
+        vol.Required(CONF_DOCKED_DWELL_TIME, default=DEFAULT_DWELL_TIME): (
+            _number_selector(600, 1, "s")
+        ),
+        vol.Required(CONF_CHARGING_DWELL_TIME, default=DEFAULT_DWELL_TIME): (
+            _number_selector(600, 1, "s")
+        ),
+        vol.Required(
+            CONF_SAMPLE_INTERVAL, default=DEFAULT_SAMPLE_INTERVAL
+        ): _number_selector(60, 0.5, "s"),
+        vol.Required(
+            CONF_MAX_MOWING_TIME, default=DEFAULT_MAX_MOWING_TIME
+        ): _number_selector(1440, 1, "min"),
+        vol.Required(
+            CONF_STUCK_POWER_TIME, default=DEFAULT_STUCK_POWER_TIME
+        ): _number_selector(3600, 1, "s"),
+        vol.Required(
+            CONF_SCHEDULE_ENFORCE, default=False
+        ): selector.BooleanSelector(),
+        vol.Required(
+            CONF_WINDOW_START, default=DEFAULT_WINDOW_START
+        ): selector.TimeSelector(),
+        vol.Required(CONF_WINDOW_END, default=DEFAULT_WINDOW_END): (
+            selector.TimeSelector()
+        ),
+        vol.Required(
+            CONF_WEEKLY_MOWING_TIME, default=DEFAULT_WEEKLY_MOWING_TIME
+        ): _number_selector(168, 0.5, "h"),
+        vol.Optional(CONF_RAIN_SENSOR): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain=[BINARY_SENSOR_DOMAIN, SENSOR_DOMAIN]
+            ),
+        ),
+        vol.Optional(CONF_TEMPERATURE_SENSOR): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=SENSOR_DOMAIN),
+        ),
+        vol.Required(
+            CONF_MIN_TEMPERATURE, default=DEFAULT_MIN_TEMPERATURE
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=-20,
+                max=30,
+                step=0.5,
+                unit_of_measurement="°C",
+                mode=selector.NumberSelectorMode.BOX,
+            ),
+        ),
+        vol.Required(CONF_POWER_CUT, default=False): selector.BooleanSelector(),
+        vol.Required(CONF_IDLE_CUT_TIME, default=DEFAULT_IDLE_CUT_TIME): (
+            _number_selector(1440, 1, "min")
+        ),
     }
 )
 
 
+def validate_options(options: dict[str, Any]) -> dict[str, str]:
+    """Validate that the power bands do not overlap."""
+    mowing_max = options[CONF_MOWING_MAX_POWER]
+    charging_min = options[CONF_CHARGING_MIN_POWER]
+    if not 0 < mowing_max < charging_min:
+        return {CONF_CHARGING_MIN_POWER: "invalid_thresholds"}
+    if options[CONF_HYSTERESIS] * 2 >= charging_min - mowing_max:
+        return {CONF_HYSTERESIS: "invalid_hysteresis"}
+    if options[CONF_SAMPLE_WINDOW] < 1:
+        return {CONF_SAMPLE_WINDOW: "invalid_sample_window"}
+    return {}
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input.
 
-    Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
+    Data has the keys from STEP_ENTITIES_DATA_SCHEMA with values provided by the user.
     """
     return {
         "title": "Robby",
@@ -48,15 +234,96 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> RobbyOptionsFlow:
+        """Create the options flow."""
+        return RobbyOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle the initial step."""
+        """Choose between real entities and a simulated Robby."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["entities", "simulator"]
+        )
+
+    async def async_step_entities(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle a Robby backed by a power sensor and a switch."""
         errors: dict[str, str] = {}
         if user_input is not None:
+            self._async_abort_entries_match(
+                {CONF_POWER_SENSOR: user_input[CONF_POWER_SENSOR]}
+            )
             info = await validate_input(self.hass, user_input)
             return self.async_create_entry(title=info["title"], data=user_input)
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="entities", data_schema=STEP_ENTITIES_DATA_SCHEMA, errors=errors
+        )
+
+    async def async_step_simulator(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle a Robby backed by a simulated power sensor and switch."""
+        if user_input is not None:
+            slug = slugify(user_input[CONF_NAME])
+            data = {
+                CONF_POWER_SENSOR: f"sensor.{slug}_power",
+                CONF_SWITCH_SENSOR: f"switch.{slug}_switch",
+                CONF_SAMPLE_INTERVAL: user_input.get(
+                    CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+                ),
+            }
+            self._async_abort_entries_match(
+                {CONF_POWER_SENSOR: data[CONF_POWER_SENSOR]}
+            )
+            data[CONF_SIMULATOR] = {
+                key: user_input[key]
+                for key in (
+                    CONF_SPEED_UP,
+                    CONF_SAMPLES_PER_SECOND,
+                    CONF_MOWING_TIME,
+                    CONF_CHARGING_TIME,
+                    CONF_DOCKED_TIME,
+                    CONF_NOISE,
+                )
+            }
+            return self.async_create_entry(title=user_input[CONF_NAME], data=data)
+
+        return self.async_show_form(
+            step_id="simulator", data_schema=STEP_SIMULATOR_DATA_SCHEMA
+        )
+
+
+class RobbyOptionsFlow(OptionsFlow):
+    """Handle the options of a Robby.
+
+    The options are applied to the running entry by its update listener.
+    """
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the thresholds, timing and sampling."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if not (errors := validate_options(user_input)):
+                return self.async_create_entry(data=user_input)
+
+        suggested_values = {
+            CONF_SAMPLE_INTERVAL: self.config_entry.data.get(
+                CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+            ),
+            **self.config_entry.options,
+            **(user_input or {}),
+        }
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, suggested_values
+            ),
+            errors=errors,
         )
@@ -1,10 +1,126 @@
 """Constants for the Robby integration."""
 
+from datetime import timedelta
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+
 ATTR_CHARGING = "charging"
+ATTR_STUCK_REASON = "reason"
 
 DOMAIN = "robby"
 
 CONF_POWER_SENSOR = "power_sensor"
 CONF_SWITCH_SENSOR = "switch_sensor"
+CONF_SAMPLE_INTERVAL = "sample_interval"
+CONF_MOWING_MAX_POWER = "mowing_max_power"
+CONF_CHARGING_MIN_POWER = "charging_min_power"
+CONF_HYSTERESIS = "hysteresis"
+CONF_SAMPLE_WINDOW = "sample_window"
+CONF_ERROR_DWELL_TIME = "error_dwell_time"
+CONF_MOWING_DWELL_TIME = "mowing_dwell_time"
+CONF_DOCKED_DWELL_TIME = "docked_dwell_time"
+CONF_CHARGING_DWELL_TIME = "charging_dwell_time"
+CONF_MAX_MOWING_TIME = "max_mowing_time"
+CONF_STUCK_POWER_TIME = "stuck_power_time"
+CONF_SCHEDULE_ENFORCE = "schedule_enforce"
+CONF_WINDOW_START = "window_start"
+CONF_WINDOW_END = "window_end"
+CONF_WEEKLY_MOWING_TIME = "weekly_mowing_time"
+CONF_RAIN_SENSOR = "rain_sensor"
+CONF_TEMPERATURE_SENSOR = "temperature_sensor"
+CONF_MIN_TEMPERATURE = "min_temperature"
+CONF_POWER_CUT = "power_cut"
+CONF_IDLE_CUT_TIME = "idle_cut_time"
+CONF_SIMULATOR = "simulator"
+CONF_SPEED_UP = "speed_up"
+CONF_SAMPLES_PER_SECOND = "samples_per_second"
+CONF_MOWING_TIME = "mowing_time"
+CONF_CHARGING_TIME = "charging_time"
+CONF_DOCKED_TIME = "docked_time"
+CONF_NOISE = "noise"
 
 STATE_CHARGING = "charging"
+
+EVENT_MOWING_STARTED = "mowing_started"
+EVENT_MOWING_FINISHED = "mowing_finished"
+EVENT_CHARGING_STARTED = "charging_started"
+EVENT_CHARGING_FINISHED = "charging_finished"
+EVENT_STUCK = "stuck"
+EVENT_RELEASED = "released"
+EVENT_TYPES = (
+    EVENT_MOWING_STARTED,
+    EVENT_MOWING_FINISHED,
+    EVENT_CHARGING_STARTED,
+    EVENT_CHARGING_FINISHED,
+    EVENT_STUCK,
+    EVENT_RELEASED,
+)
+
+STUCK_REASON_MANUAL = "manual"
+STUCK_REASON_MAX_MOWING_TIME = "max_mowing_time"
+STUCK_REASON_NO_POWER = "no_power"
+
+KEY_LAWN_MOWER = "robby_lawn_mower"
+KEY_CHARGING = "robby_charging_binary_sensor"
+KEY_PROBLEM = "robby_problem_binary_sensor"
+KEY_START_MOWING_CYCLE = "robby_start_mowing_cycle"
+KEY_END_MOWING_CYCLE = "robby_end_mowing_cycle"
+KEY_START_CHARGING_CYCLE = "robby_start_charging_cycle"
+KEY_END_CHARGING_CYCLE = "robby_end_charging_cycle"
+KEY_STUCK = "robby_stuck_switch"
+KEY_SESSION_ENERGY = "robby_charging_session_energy"
+KEY_TOTAL_ENERGY = "robby_charging_energy"
+KEY_AVERAGE_POWER = "robby_average_charging_power"
+KEY_MOWING_TIME_DAY = "robby_mowing_time_day"
+KEY_MOWING_TIME_WEEK = "robby_mowing_time_week"
+KEY_MOWING_SESSIONS_WEEK = "robby_mowing_sessions_week"
+KEY_AVERAGE_MOWING_TIME = "robby_average_mowing_time"
+KEY_CHARGE_TO_MOW_RATIO = "robby_charge_to_mow_ratio"
+KEY_NEXT_WINDOW_START = "robby_next_mowing_window_start"
+KEY_NEXT_WINDOW_END = "robby_next_mowing_window_end"
+KEY_BATTERY_LEVEL = "robby_battery_level"
+KEY_TIME_TO_FULL = "robby_time_to_full"
+
+DEFAULT_SAMPLE_INTERVAL = 0.0
+DEFAULT_MOWING_MAX_POWER = 2.0
+DEFAULT_CHARGING_MIN_POWER = 3.0
+DEFAULT_HYSTERESIS = 0.25
+DEFAULT_SAMPLE_WINDOW = 3
+DEFAULT_DWELL_TIME = 10.0
+DEFAULT_DWELL_TIMES = {
+    LawnMowerActivity.ERROR: DEFAULT_DWELL_TIME,
+    LawnMowerActivity.MOWING: DEFAULT_DWELL_TIME,
+    LawnMowerActivity.DOCKED: DEFAULT_DWELL_TIME,
+    STATE_CHARGING: DEFAULT_DWELL_TIME,
+}
+DWELL_TIME_OPTIONS = {
+    LawnMowerActivity.ERROR: CONF_ERROR_DWELL_TIME,
+    LawnMowerActivity.MOWING: CONF_MOWING_DWELL_TIME,
+    LawnMowerActivity.DOCKED: CONF_DOCKED_DWELL_TIME,
+    STATE_CHARGING: CONF_CHARGING_DWELL_TIME,
+}
+DEFAULT_MAX_MOWING_TIME = 180.0
+DEFAULT_STUCK_POWER_TIME = 300.0
+DEFAULT_WINDOW_START = "10:00:00"
+DEFAULT_WINDOW_END = "18:00:00"
+DEFAULT_WEEKLY_MOWING_TIME = 0.0
+DEFAULT_MIN_TEMPERATURE = 8.0
+DEFAULT_IDLE_CUT_TIME = 30.0
+
+HISTORY_MAX_SESSIONS = 5000
+HISTORY_RETENTION = timedelta(days=400)
+HISTORY_SAVE_DELAY = 30
+
+AGGREGATE_WINDOW_HOURS = 7 * 24
+
+STATISTICS_FLUSH_DELAY = 60
+
+POWER_RESTORE_LEAD = 300
+
+BATTERY_PROFILE_SESSIONS = 20
+BATTERY_RETURN_LEVEL = 20.0
+BATTERY_TAPER_FRACTION = 0.8
+BATTERY_TAPER_LEVEL = 80.0
+
+ANOMALY_MIN_SESSIONS = 10
+ANOMALY_THRESHOLD = 3.0
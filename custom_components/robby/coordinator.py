@@ -0,0 +1,634 @@
+"""Shared state coordinator for the Robby integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime
+import logging
+import time
+from typing import Any
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_DEVICE_ID,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity_registry as er,
+    issue_registry as ir,
+)
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+
+from .aggregates import RobbySessionAggregates
+from .anomaly import RobbyAnomalyDetector
+from .battery import RobbyBatteryEstimator, RobbyChargeProfile
+from .classifier import ActivityClassifier, ClassifierConfig
+from .const import (
+    ATTR_STUCK_REASON,
+    CONF_POWER_SENSOR,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SWITCH_SENSOR,
+    DEFAULT_SAMPLE_INTERVAL,
+    DOMAIN,
+    EVENT_CHARGING_FINISHED,
+    EVENT_MOWING_FINISHED,
+    EVENT_RELEASED,
+    EVENT_STUCK,
+    STATE_CHARGING,
+)
+from .cycle import RobbyCycleState
+from .device_binding import get_device_info
+from .energy import ChargingEnergyMeter
+from .history import SESSION_MOWING, RobbySession, RobbySessionHistory
+from .metrics import RobbyMetrics
+from .planner import RobbyMowingPlanner
+from .protection import RobbyPlugProtection
+from .statistics_import import RobbyStatistics
+
+_LOGGER = logging.getLogger(__name__)
+
+type RobbyConfigEntry = ConfigEntry[RobbyCoordinator]
+type RobbyTransitionListener = Callable[[str | None, str | None], None]
+
+
+@dataclass(frozen=True, slots=True)
+class RobbySnapshot:
+    """Parsed state of the entities backing a Robby."""
+
+    power: float = 0
+    power_available: bool = False
+    switch_on: bool = False
+    switch_available: bool = False
+    stuck: bool = False
+    activity: str = LawnMowerActivity.ERROR
+
+    @property
+    def available(self) -> bool:
+        """Return if all backing entities are available."""
+        return self.power_available and self.switch_available
+
+    @property
+    def charging(self) -> bool:
+        """Return if the Robby is charging."""
+        return self.activity == STATE_CHARGING
+
+    @property
+    def state(self) -> str:
+        """Return the lawn mower state as seen by the cycle tracking."""
+        return self.activity if self.available else STATE_UNAVAILABLE
+
+
+def _parse_power(state: State | None) -> tuple[float, bool]:
+    """Parse a power state into its value and availability."""
+    if state is None:
+        return 0, False
+    # A plug that does not know its power is not a plug at zero.
+    if state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return 0, False
+    try:
+        value = float(state.state)
+    except (ValueError, TypeError, AttributeError):
+        value = -1
+    return value, True
+
+
+def _parse_on_off(state: State | None) -> tuple[bool, bool]:
+    """Parse an on/off state into its value and availability."""
+    if state is None:
+        return False, False
+    return state.state == STATE_ON, state.state != STATE_UNAVAILABLE
+
+
+def _sample_interval(entry: RobbyConfigEntry) -> float:
+    """Return the minimum interval between two power evaluations."""
+    return entry.options.get(
+        CONF_SAMPLE_INTERVAL,
+        entry.data.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL),
+    )
+
+
+def _async_add_to(listeners: list[Any], listener: Any) -> CALLBACK_TYPE:
+    """Add a listener and return a callback that removes it once."""
+    listeners.append(listener)
+
+    @callback
+    def remove_listener() -> None:
+        if listener in listeners:
+            listeners.remove(listener)
+
+    return remove_listener
+
+
+def derive_activity(power_activity: str | None, switch_on: bool, stuck: bool) -> str:
+    """Derive the lawn mower activity from the classified power signal."""
+    if not switch_on or power_activity is None:
+        return LawnMowerActivity.ERROR
+    if power_activity == LawnMowerActivity.MOWING and stuck:
+        return LawnMowerActivity.ERROR
+    return power_activity
+
+
+class RobbyCoordinator:
+    """Track the power and switch entities of a Robby and fan out updates.
+
+    The coordinator subscribes once per config entry, parses every state
+    change once and shares the resulting snapshot with all entities and
+    the cycle tracking.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: RobbyConfigEntry) -> None:
+        """Initialize the coordinator."""
+        self.hass = hass
+        self.entry = entry
+        self.power_sensor: str = entry.data[CONF_POWER_SENSOR]
+        self.switch_entity: str = entry.data[CONF_SWITCH_SENSOR]
+        self.device_info = get_device_info(hass, entry)
+        self.data = RobbySnapshot()
+        self.cycle = RobbyCycleState()
+        self.history = RobbySessionHistory(hass, entry.entry_id)
+        self.energy = ChargingEnergyMeter()
+        self.battery = RobbyBatteryEstimator(self.energy)
+        self.anomalies = RobbyAnomalyDetector()
+        self.aggregates = RobbySessionAggregates()
+        self.metrics = RobbyMetrics()
+        self.entity_ids: dict[str, str] = {}
+        self.device_id: str | None = None
+        self.classifier = ActivityClassifier(
+            ClassifierConfig.from_options(entry.options)
+        )
+        self.sample_interval = _sample_interval(entry)
+        self.planner = RobbyMowingPlanner(self)
+        self.statistics = RobbyStatistics(self)
+        self.protection = RobbyPlugProtection(self)
+        self._last_evaluation = 0.0
+        self._throttled_sample: tuple[float, float] | None = None
+        self._unsub_throttle_timer: CALLBACK_TYPE | None = None
+        self._unsub_dwell_timer: CALLBACK_TYPE | None = None
+        self._unsub_aggregates_timer: CALLBACK_TYPE | None = None
+        self._last_state: str | None = None
+        self._started = False
+        self._tracked_entities: dict[str, Entity] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._session_listeners: list[CALLBACK_TYPE] = []
+        self._transition_listeners: list[RobbyTransitionListener] = []
+
+    @callback
+    def async_setup(self) -> None:
+        """Compute the first snapshot from the backing entities."""
+        # Unload callbacks run in reverse order, so this check runs last.
+        self.entry.async_on_unload(self._async_check_teardown)
+        # A reload reads the history from disk, so the delayed save is flushed.
+        self.entry.async_on_unload(self.history.async_save)
+        self.entry.async_on_unload(self._async_cancel_aggregates_timer)
+        power, power_available = _parse_power(self.hass.states.get(self.power_sensor))
+        switch_on, switch_available = _parse_on_off(
+            self.hass.states.get(self.switch_entity)
+        )
+        if power_available:
+            self.classifier.add_sample(power, time.time())
+        self._async_update_snapshot(
+            power=power,
+            power_available=power_available,
+            switch_on=switch_on,
+            switch_available=switch_available,
+            stuck=self.cycle.stuck,
+        )
+        self._last_state = self.data.state
+
+    @callback
+    def async_start(self) -> None:
+        """Subscribe to the backing entities once the entities are restored.
+
+        State changes that happened while the entities were set up are caught
+        up with first, so the subscription starts from the current states.
+        """
+        self._started = True
+        self.entry.async_on_unload(self._async_cancel_dwell_timer)
+        self.entry.async_on_unload(self._async_cancel_throttle_timer)
+        self.entry.async_on_unload(
+            async_track_state_change_event(
+                self.hass,
+                [self.power_sensor, self.switch_entity],
+                self._async_handle_state_change,
+            )
+        )
+
+        timestamp = time.time()
+        power, power_available = _parse_power(self.hass.states.get(self.power_sensor))
+        if (power, power_available) != (self.data.power, self.data.power_available):
+            self._async_process_power(power, timestamp, power_available)
+        switch_on, switch_available = _parse_on_off(
+            self.hass.states.get(self.switch_entity)
+        )
+        if (switch_on, switch_available) != (
+            self.data.switch_on,
+            self.data.switch_available,
+        ):
+            self._async_publish(
+                timestamp, switch_on=switch_on, switch_available=switch_available
+            )
+
+    @callback
+    def async_update_options(self) -> None:
+        """Apply changed options to the running classifier and throttling."""
+        self.classifier.reconfigure(ClassifierConfig.from_options(self.entry.options))
+        self.sample_interval = _sample_interval(self.entry)
+
+        now = time.time()
+        self.classifier.evaluate(now)
+        self._async_schedule_dwell_timer()
+        self._async_update_snapshot()
+        self._async_dispatch(now)
+
+    @callback
+    def async_index_entities(self) -> None:
+        """Resolve the device and entity ids of this entry through the registries."""
+        if device := dr.async_get(self.hass).async_get_device(
+            identifiers=self.device_info["identifiers"]
+        ):
+            self.device_id = device.id
+        suffix = f"_{self.power_sensor}_{self.switch_entity}"
+        self.entity_ids = {
+            entity_entry.unique_id.removesuffix(suffix): entity_entry.entity_id
+            for entity_entry in er.async_entries_for_config_entry(
+                er.async_get(self.hass), self.entry.entry_id
+            )
+        }
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for snapshot updates."""
+        return _async_add_to(self._listeners, update_callback)
+
+    @callback
+    def async_add_session_listener(
+        self, session_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for closed sessions."""
+        return _async_add_to(self._session_listeners, session_callback)
+
+    @callback
+    def async_add_transition_listener(
+        self, transition_callback: RobbyTransitionListener
+    ) -> CALLBACK_TYPE:
+        """Listen for changes of the lawn mower state."""
+        return _async_add_to(self._transition_listeners, transition_callback)
+
+    @callback
+    def async_add_tracked_entity(
+        self, key: str, entity: Entity
+    ) -> CALLBACK_TYPE:
+        """Register an entity updated in-process by the cycle tracking."""
+        self._tracked_entities[key] = entity
+
+        @callback
+        def remove_entity() -> None:
+            if self._tracked_entities.get(key) is entity:
+                del self._tracked_entities[key]
+
+        return remove_entity
+
+    def listener_counts(self) -> dict[str, int]:
+        """Return the number of registered listeners per kind."""
+        return {
+            "listeners": len(self._listeners),
+            "session_listeners": len(self._session_listeners),
+            "transition_listeners": len(self._transition_listeners),
+            "tracked_entities": len(self._tracked_entities),
+        }
+
+    @callback
+    def _async_check_teardown(self) -> None:
+        """Drop the listeners that outlived the unload of the entry.
+
+        Every listener is removed by its owner on unload, so anything left
+        would keep a stale entity or tracker alive across reloads.
+        """
+        if any(self.listener_counts().values()):
+            _LOGGER.warning(
+                "%s left listeners behind on unload: %s",
+                self.entry.title,
+                self.listener_counts(),
+            )
+        self._listeners.clear()
+        self._session_listeners.clear()
+        self._transition_listeners.clear()
+        self._tracked_entities.clear()
+
+    @callback
+    def async_apply_cycle_changes(self, changes: dict[str, Any]) -> None:
+        """Apply all changes of one transition and write each entity once."""
+        for key, value in changes.items():
+            self.cycle.set(key, value)
+
+        for key in changes:
+            if (entity := self._tracked_entities.get(key)) is not None:
+                entity.async_write_ha_state()
+                self.metrics.state_writes += 1
+
+        if self.cycle.stuck != self.data.stuck:
+            # Restoring the stuck state on startup is not an event.
+            if self._started:
+                self.async_fire_event(
+                    EVENT_STUCK if self.cycle.stuck else EVENT_RELEASED,
+                    {ATTR_STUCK_REASON: self.cycle.stuck_reason}
+                    if self.cycle.stuck
+                    else {},
+                )
+            self._async_update_snapshot(stuck=self.cycle.stuck)
+            self._async_dispatch(time.time())
+
+    @callback
+    def async_record_session(self, session: RobbySession) -> None:
+        """Log a closed session and update the aggregates."""
+        self.history.async_add_session(session)
+        self.aggregates.add_sessions((session,))
+        self.battery.profile.add_sessions((session,))
+        self.statistics.async_add_session(session)
+        if self.anomalies.check_session(session):
+            self._async_update_anomaly_issue()
+        self._async_schedule_aggregates_timer()
+        self._async_notify_session_listeners()
+
+        event_data: dict[str, Any] = {
+            "start": session.start.isoformat(),
+            "duration": session.duration.total_seconds(),
+            "outcome": session.outcome,
+        }
+        if session.kind == SESSION_MOWING:
+            self.async_fire_event(EVENT_MOWING_FINISHED, event_data)
+        else:
+            event_data["energy"] = session.energy
+            self.async_fire_event(EVENT_CHARGING_FINISHED, event_data)
+
+    @callback
+    def async_turn_switch(self, turn_on: bool, reason: str) -> None:
+        """Turn the switch of the Robby on or off without waiting for it."""
+        _LOGGER.debug(
+            "%s switched %s by %s",
+            self.entry.title,
+            STATE_ON if turn_on else STATE_OFF,
+            reason,
+        )
+        self.metrics.service_calls += 1
+        self.entry.async_create_background_task(
+            self.hass,
+            self.hass.services.async_call(
+                "homeassistant",
+                SERVICE_TURN_ON if turn_on else SERVICE_TURN_OFF,
+                {"entity_id": self.switch_entity},
+            ),
+            "robby_turn_switch",
+        )
+
+    @callback
+    def async_fire_event(self, event: str, data: dict[str, Any]) -> None:
+        """Fire a lifecycle event of this Robby on the event bus."""
+        self.hass.bus.async_fire(
+            f"{DOMAIN}_{event}",
+            {ATTR_DEVICE_ID: self.device_id, "entry_id": self.entry.entry_id, **data},
+        )
+
+    async def async_load_aggregates(self) -> None:
+        """Seed the aggregates and session models from the session history."""
+        sessions = await self.history.async_get_sessions()
+        # The history includes the sessions recorded while it was loading.
+        self.aggregates = RobbySessionAggregates()
+        self.aggregates.add_sessions(sessions)
+        self.battery.profile = RobbyChargeProfile()
+        self.battery.profile.add_sessions(sessions)
+        self.anomalies.seed(sessions)
+        self._async_schedule_aggregates_timer()
+        self._async_notify_session_listeners()
+
+    @callback
+    def _async_notify_session_listeners(self) -> None:
+        """Notify the listeners of changed session aggregates."""
+        for session_callback in list(self._session_listeners):
+            session_callback()
+
+    @callback
+    def _async_schedule_aggregates_timer(self) -> None:
+        """Refresh the aggregates once their oldest bucket expires."""
+        self._async_cancel_aggregates_timer()
+        if (next_expiry := self.aggregates.next_expiry) is None:
+            return
+        self._unsub_aggregates_timer = async_call_later(
+            self.hass,
+            max(next_expiry - time.time(), 0),
+            self._async_handle_aggregates_timer,
+        )
+
+    @callback
+    def _async_cancel_aggregates_timer(self) -> None:
+        """Cancel the pending aggregates timer."""
+        if self._unsub_aggregates_timer is not None:
+            self._unsub_aggregates_timer()
+            self._unsub_aggregates_timer = None
+
+    @callback
+    def _async_handle_aggregates_timer(self, now: datetime) -> None:
+        """Drop the expired buckets without waiting for a new session."""
+        self._unsub_aggregates_timer = None
+        self.aggregates.refresh()
+        self._async_schedule_aggregates_timer()
+        self._async_notify_session_listeners()
+
+    @callback
+    def _async_update_anomaly_issue(self) -> None:
+        """Raise or clear the repair issue of anomalous sessions."""
+        issue_id = f"session_anomaly_{self.entry.entry_id}"
+        if not (anomalies := self.anomalies.anomalies):
+            ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+            return
+        _LOGGER.warning("%s had an anomalous session: %s", self.entry.title, anomalies)
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="session_anomaly",
+            translation_placeholders={
+                "name": self.entry.title,
+                "anomalies": ", ".join(
+                    f"{metric} ({deviation:+} σ)"
+                    for metric, deviation in anomalies.items()
+                ),
+            },
+        )
+
+    @callback
+    def _async_handle_state_change(self, event: Event[EventStateChangedData]) -> None:
+        """Parse a state change of one of the backing entities."""
+        started = time.perf_counter()
+        entity_id = event.data["entity_id"]
+        new_state = event.data["new_state"]
+        timestamp = event.time_fired_timestamp
+        self.metrics.events[entity_id] += 1
+
+        if entity_id == self.power_sensor:
+            power, power_available = _parse_power(new_state)
+            if power_available and self._async_throttle(power, timestamp):
+                self.metrics.throttled_events += 1
+            else:
+                self._async_process_power(power, timestamp, power_available)
+        else:
+            switch_on, switch_available = _parse_on_off(new_state)
+            self._async_publish(
+                timestamp, switch_on=switch_on, switch_available=switch_available
+            )
+
+        self.metrics.record_latency(time.perf_counter() - started)
+
+    @callback
+    def _async_throttle(self, power: float, timestamp: float) -> bool:
+        """Hold back a power sample that arrives within the sample interval.
+
+        Samples that cross a classification boundary are never held back, and
+        the latest held sample is evaluated once the interval has passed.
+        """
+        if (
+            not self.sample_interval
+            or not self.data.power_available
+            or timestamp - self._last_evaluation >= self.sample_interval
+            or self.classifier.crosses_boundary(power)
+        ):
+            return False
+
+        self._throttled_sample = (power, timestamp)
+        if self._unsub_throttle_timer is None:
+            self._unsub_throttle_timer = async_call_later(
+                self.hass,
+                max(self._last_evaluation + self.sample_interval - time.time(), 0),
+                self._async_handle_throttle_timer,
+            )
+        return True
+
+    @callback
+    def _async_handle_throttle_timer(self, now: datetime) -> None:
+        """Evaluate the latest power sample that was held back."""
+        self._unsub_throttle_timer = None
+        if (sample := self._throttled_sample) is not None:
+            self._async_process_power(*sample, power_available=True)
+
+    @callback
+    def _async_cancel_throttle_timer(self) -> None:
+        """Cancel the pending throttle timer."""
+        if self._unsub_throttle_timer is not None:
+            self._unsub_throttle_timer()
+            self._unsub_throttle_timer = None
+
+    @callback
+    def _async_process_power(
+        self, power: float, timestamp: float, power_available: bool
+    ) -> None:
+        """Feed a power sample to the classifier and publish the result."""
+        self._last_evaluation = timestamp
+        self._throttled_sample = None
+        self._async_cancel_throttle_timer()
+        if power_available:
+            self.classifier.add_sample(power, timestamp)
+            self._async_schedule_dwell_timer()
+        self._async_publish(timestamp, power=power, power_available=power_available)
+
+    @callback
+    def _async_publish(self, timestamp: float, **changes: Any) -> None:
+        """Update the snapshot and dispatch it when it changed."""
+        old_data = self.data
+        self._async_update_snapshot(**changes)
+        if self.data == old_data:
+            self.metrics.dropped_events += 1
+            _LOGGER.debug(
+                "Ignoring state change without effect for %s", self.entry.title
+            )
+            return
+        self._async_dispatch(timestamp)
+
+    @callback
+    def _async_schedule_dwell_timer(self) -> None:
+        """Re-evaluate the classifier when a pending activity becomes stable."""
+        self._async_cancel_dwell_timer()
+        if (next_evaluation := self.classifier.next_evaluation) is None:
+            return
+        self._unsub_dwell_timer = async_call_later(
+            self.hass,
+            max(next_evaluation - time.time(), 0),
+            self._async_handle_dwell_timer,
+        )
+
+    @callback
+    def _async_cancel_dwell_timer(self) -> None:
+        """Cancel the pending dwell timer."""
+        if self._unsub_dwell_timer is not None:
+            self._unsub_dwell_timer()
+            self._unsub_dwell_timer = None
+
+    @callback
+    def _async_handle_dwell_timer(self, now: datetime) -> None:
+        """Promote a pending activity without waiting for a new sample."""
+        self._unsub_dwell_timer = None
+        old_data = self.data
+        self.classifier.evaluate(now.timestamp())
+        self._async_schedule_dwell_timer()
+        self._async_update_snapshot()
+        if self.data != old_data:
+            self._async_dispatch(now.timestamp())
+
+    @callback
+    def _async_update_snapshot(self, **changes: Any) -> None:
+        """Store a new snapshot and derive its activity once."""
+        data = replace(self.data, **changes)
+        self.data = replace(
+            data,
+            activity=derive_activity(
+                self.classifier.activity, data.switch_on, data.stuck
+            ),
+        )
+
+    @callback
+    def _async_dispatch(self, timestamp: float) -> None:
+        """Fan the current snapshot out to entities and cycle tracking."""
+        data = self.data
+        self.energy.update(
+            data.power if data.power_available and data.power >= 0 else None,
+            timestamp,
+            data.charging,
+        )
+        if data.available:
+            self.battery.update(data.activity, data.power, timestamp)
+
+        for update_callback in list(self._listeners):
+            update_callback()
+
+        old_state = self._last_state
+        new_state = self._last_state = self.data.state
+        if old_state == new_state:
+            return
+
+        _LOGGER.debug(
+            "%s transitions from %s to %s", self.entry.title, old_state, new_state
+        )
+        self.metrics.transitions[f"{old_state}->{new_state}"] += 1
+        for transition_callback in list(self._transition_listeners):
+            transition_callback(old_state, new_state)
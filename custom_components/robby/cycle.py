@@ -0,0 +1,62 @@
+"""Cycle state of the Robby integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .const import (
+    ATTR_STUCK_REASON,
+    KEY_END_CHARGING_CYCLE,
+    KEY_END_MOWING_CYCLE,
+    KEY_START_CHARGING_CYCLE,
+    KEY_START_MOWING_CYCLE,
+    KEY_STUCK,
+)
+
+_FIELDS = {
+    KEY_START_MOWING_CYCLE: "mowing_start",
+    KEY_END_MOWING_CYCLE: "mowing_end",
+    KEY_START_CHARGING_CYCLE: "charging_start",
+    KEY_END_CHARGING_CYCLE: "charging_end",
+    KEY_STUCK: "stuck",
+    ATTR_STUCK_REASON: "stuck_reason",
+}
+
+
+def _is_open(start: datetime | None, end: datetime | None) -> bool:
+    """Return if a cycle has started and not ended since."""
+    if start is None:
+        return False
+    return end is None or start > end
+
+
+@dataclass(slots=True)
+class RobbyCycleState:
+    """Start and end of the mowing and charging cycles of a Robby."""
+
+    mowing_start: datetime | None = None
+    mowing_end: datetime | None = None
+    charging_start: datetime | None = None
+    charging_end: datetime | None = None
+    stuck: bool = False
+    stuck_reason: str | None = None
+
+    @property
+    def mowing(self) -> bool:
+        """Return if a mowing cycle is open."""
+        return _is_open(self.mowing_start, self.mowing_end)
+
+    @property
+    def charging(self) -> bool:
+        """Return if a charging cycle is open."""
+        return _is_open(self.charging_start, self.charging_end)
+
+    def get(self, key: str) -> Any:
+        """Return the value of the entity with the given key."""
+        return getattr(self, _FIELDS[key])
+
+    def set(self, key: str, value: Any) -> None:
+        """Set the value of the entity with the given key."""
+        setattr(self, _FIELDS[key], value)
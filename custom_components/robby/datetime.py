@@ -9,27 +9,33 @@ from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from . import RobbyConfigEntry
-from .const import CONF_POWER_SENSOR, CONF_SWITCH_SENSOR
-from .device_binding import get_device_info
+from .const import (
+    CONF_POWER_SENSOR,
+    CONF_SWITCH_SENSOR,
+    KEY_END_CHARGING_CYCLE,
+    KEY_END_MOWING_CYCLE,
+    KEY_START_CHARGING_CYCLE,
+    KEY_START_MOWING_CYCLE,
+)
 
 ENTITIES: tuple[DateTimeEntityDescription, ...] = (
     DateTimeEntityDescription(
-        key="robby_start_mowing_cycle",
+        key=KEY_START_MOWING_CYCLE,
         name="Robby start mowing cycle",
         icon="mdi:clock-start",
     ),
     DateTimeEntityDescription(
-        key="robby_end_mowing_cycle",
+        key=KEY_END_MOWING_CYCLE,
         name="Robby end mowing cycle",
         icon="mdi:clock-end",
     ),
     DateTimeEntityDescription(
-        key="robby_start_charging_cycle",
+        key=KEY_START_CHARGING_CYCLE,
         name="Robby start charging cycle",
         icon="mdi:clock-start",
     ),
     DateTimeEntityDescription(
-        key="robby_end_charging_cycle",
+        key=KEY_END_CHARGING_CYCLE,
         name="Robby end charging cycle",
         icon="mdi:clock-end",
     ),
@@ -45,7 +51,7 @@ async def async_setup_entry(
     entities: list = [
         RobbyDateTimeEntity(hass, entry, description) for description in ENTITIES
     ]
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
 
 
 class RobbyDateTimeEntity(DateTimeEntity, RestoreEntity):
@@ -62,17 +68,18 @@ class RobbyDateTimeEntity(DateTimeEntity, RestoreEntity):
         self.entry = entry
         self._power_sensor = entry.data[CONF_POWER_SENSOR]
         self._switch_entity = entry.data[CONF_SWITCH_SENSOR]
+        self._key = description.key
         self._attr_name = description.name
         self._attr_unique_id = (
             f"{description.key}_{self._power_sensor}_{self._switch_entity}"
         )
-        self._state: datetime | None = None
-        self.device_info = get_device_info(hass, entry)
+        self.coordinator = entry.runtime_data
+        self._attr_device_info = self.coordinator.device_info
 
     @property
-    def native_value(self):
+    def native_value(self) -> datetime | None:
         """Return the state of the datetime."""
-        return self._state
+        return self.coordinator.cycle.get(self._key)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
@@ -80,11 +87,15 @@ class RobbyDateTimeEntity(DateTimeEntity, RestoreEntity):
 
         state = await self.async_get_last_state()
         if not state or state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-            self._state = None
+            value = None
         else:
-            self._state = datetime.fromisoformat(state.state)
+            value = datetime.fromisoformat(state.state)
+        self.coordinator.async_apply_cycle_changes({self._key: value})
+
+        self.async_on_remove(
+            self.coordinator.async_add_tracked_entity(self._key, self)
+        )
 
     async def async_set_value(self, value: datetime) -> None:
         """Update the current value."""
-        self._state = value
-        self.async_write_ha_state()
+        self.coordinator.async_apply_cycle_changes({self._key: value})
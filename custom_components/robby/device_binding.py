@@ -1,11 +1,11 @@
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 
-from . import RobbyConfigEntry
 from .const import CONF_POWER_SENSOR, DOMAIN
 
 
-def get_device_info(hass: HomeAssistant, entry: RobbyConfigEntry) -> DeviceInfo:
+def get_device_info(hass: HomeAssistant, entry: ConfigEntry) -> DeviceInfo:
     """Get device info for a given sensor."""
 
     return DeviceInfo(
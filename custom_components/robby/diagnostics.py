@@ -0,0 +1,52 @@
+"""Diagnostics support for the Robby integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import RobbyConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: RobbyConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    classifier = coordinator.classifier
+    planner = coordinator.planner
+    return {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "entity_ids": coordinator.entity_ids,
+        "snapshot": asdict(coordinator.data),
+        "cycle": asdict(coordinator.cycle),
+        "classifier": {
+            "config": asdict(classifier.config),
+            "activity": classifier.activity,
+            "pending": classifier.pending,
+            "pending_since": classifier.pending_since,
+        },
+        "planner": {
+            "window": asdict(planner.window) if planner.window else None,
+            "blocked": planner.blocked,
+            "learned_weekly_mowing_time": planner.learned_weekly_mowing_time,
+        },
+        "battery": {
+            "level": coordinator.battery.level,
+            "time_to_full": coordinator.battery.time_to_full,
+            "charge_energy": coordinator.battery.profile.charge_energy,
+            "mowing_time": coordinator.battery.profile.mowing_time,
+        },
+        "anomalies": {
+            "stats": {
+                metric: asdict(stats)
+                for metric, stats in coordinator.anomalies.stats.items()
+            },
+            "anomalies": coordinator.anomalies.anomalies,
+        },
+        "protection": {"cut": coordinator.protection.cut},
+        "listeners": coordinator.listener_counts(),
+        "metrics": coordinator.metrics.as_dict(),
+    }
@@ -0,0 +1,52 @@
+"""Charging energy metering for the Robby integration."""
+
+from __future__ import annotations
+
+
+class ChargingEnergyMeter:
+    """Integrate the power signal while charging.
+
+    Every sample adds the trapezoid between it and the previous sample, so
+    updating the meter is constant time and needs no history.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the meter."""
+        self.total_energy = 0.0
+        self.session_energy = 0.0
+        self.session_duration = 0.0
+        self.session_start: float | None = None
+        self._last_power: float | None = None
+        self._last_timestamp: float | None = None
+        self._charging = False
+
+    @property
+    def average_power(self) -> float | None:
+        """Return the average power of the current or last charging session."""
+        if not self.session_duration:
+            return None
+        return self.session_energy * 3600 / self.session_duration
+
+    def update(self, power: float | None, timestamp: float, charging: bool) -> None:
+        """Add a sample, or a gap when the power is not available."""
+        if (
+            self._charging
+            and power is not None
+            and self._last_power is not None
+            and self._last_timestamp is not None
+            and timestamp > self._last_timestamp
+        ):
+            duration = timestamp - self._last_timestamp
+            energy = (self._last_power + power) / 2 * duration / 3600
+            self.session_energy += energy
+            self.session_duration += duration
+            self.total_energy += energy
+
+        if charging and not self._charging:
+            self.session_energy = 0.0
+            self.session_duration = 0.0
+            self.session_start = timestamp
+
+        self._charging = charging
+        self._last_power = power
+        self._last_timestamp = timestamp
@@ -0,0 +1,155 @@
+"""Persistent session history for the Robby integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_MAX_SESSIONS,
+    HISTORY_RETENTION,
+    HISTORY_SAVE_DELAY,
+)
+
+STORAGE_VERSION = 1
+
+SESSION_MOWING = "mowing"
+SESSION_CHARGING = "charging"
+
+OUTCOME_COMPLETED = "completed"
+OUTCOME_INTERRUPTED = "interrupted"
+OUTCOME_STUCK = "stuck"
+
+
+@dataclass(frozen=True, slots=True)
+class RobbySession:
+    """A closed mowing or charging session."""
+
+    kind: str
+    start: datetime
+    end: datetime
+    energy: float | None = None
+    outcome: str = OUTCOME_COMPLETED
+
+    @property
+    def duration(self) -> timedelta:
+        """Return the duration of the session."""
+        return self.end - self.start
+
+    def as_compact(self) -> list[Any]:
+        """Return the session as a compact list for storage."""
+        return [
+            self.kind,
+            round(self.start.timestamp()),
+            round(self.duration.total_seconds()),
+            self.energy,
+            self.outcome,
+        ]
+
+    @classmethod
+    def from_compact(cls, data: list[Any]) -> RobbySession:
+        """Create a session from its compact storage form."""
+        kind, start, duration, energy, outcome = data
+        start_dt = dt_util.utc_from_timestamp(start)
+        return cls(
+            kind=kind,
+            start=start_dt,
+            end=start_dt + timedelta(seconds=duration),
+            energy=energy,
+            outcome=outcome,
+        )
+
+
+class RobbySessionHistory:
+    """Append-only log of the sessions of a Robby.
+
+    The log is only loaded from disk when it is first read or appended to,
+    and is bounded both in age and in number of sessions.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the session history."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(entry_id)
+        )
+        self._sessions: deque[RobbySession] | None = None
+        self._pending: list[RobbySession] = []
+        self._load_lock = asyncio.Lock()
+
+    async def async_get_sessions(self) -> list[RobbySession]:
+        """Return all sessions, loading them from disk when needed."""
+        return list(await self._async_load())
+
+    @callback
+    def async_add_session(self, session: RobbySession) -> None:
+        """Append a closed session and schedule a save."""
+        if self._sessions is None:
+            self._pending.append(session)
+            if len(self._pending) == 1:
+                self.hass.async_create_background_task(
+                    self._async_load(), "robby_session_history_load"
+                )
+            return
+
+        self._append(session)
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Write the sessions now instead of after the save delay."""
+        if self._sessions is None and not self._pending:
+            return
+        await self._async_load()
+        await self._store.async_save(self._data_to_save())
+
+    async def _async_load(self) -> deque[RobbySession]:
+        """Load the stored sessions and merge the ones added meanwhile."""
+        async with self._load_lock:
+            if self._sessions is not None:
+                return self._sessions
+
+            sessions: deque[RobbySession] = deque(maxlen=HISTORY_MAX_SESSIONS)
+            if (data := await self._store.async_load()) is not None:
+                sessions.extend(
+                    RobbySession.from_compact(item) for item in data["sessions"]
+                )
+            self._sessions = sessions
+
+            for session in self._pending:
+                self._append(session)
+            if self._pending:
+                self._pending.clear()
+                self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+            return sessions
+
+    def _append(self, session: RobbySession) -> None:
+        """Append a session and drop the ones outside the retention."""
+        assert self._sessions is not None
+        self._sessions.append(session)
+        cutoff = session.end - HISTORY_RETENTION
+        while self._sessions and self._sessions[0].end < cutoff:
+            self._sessions.popleft()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        assert self._sessions is not None
+        return {"sessions": [session.as_compact() for session in self._sessions]}
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of the session history of a config entry."""
+    return f"{DOMAIN}.sessions.{entry_id}"
+
+
+async def async_remove_history(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored session history of a config entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry_id)).async_remove()
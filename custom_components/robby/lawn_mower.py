@@ -1,18 +1,19 @@
 """Robby Lawn Mower Entity for Home Assistant."""
 
 from homeassistant.components.lawn_mower import (
-    LawnMowerActivity,
     LawnMowerEntity,
     LawnMowerEntityFeature,
 )
-from homeassistant.const import STATE_ON, STATE_UNAVAILABLE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
 
 from . import RobbyConfigEntry
-from .const import ATTR_CHARGING, CONF_POWER_SENSOR, CONF_SWITCH_SENSOR, STATE_CHARGING
-from .device_binding import get_device_info
+from .const import (
+    ATTR_CHARGING,
+    CONF_POWER_SENSOR,
+    CONF_SWITCH_SENSOR,
+    KEY_LAWN_MOWER,
+)
 
 
 async def async_setup_entry(
@@ -22,101 +23,59 @@ async def async_setup_entry(
 ) -> None:
     """Set up the lawn mower entity."""
     mower = RobbyLawnMowerEntity(hass, entry)
-    async_add_entities([mower], update_before_add=True)
+    async_add_entities([mower])
 
 
 class RobbyLawnMowerEntity(LawnMowerEntity):
     """Representation of a Robby lawn mower."""
 
+    _attr_should_poll = False
+
     def __init__(self, hass: HomeAssistant, entry: RobbyConfigEntry) -> None:
         """Initialize the lawn mower entity."""
         self.hass = hass
+        self.coordinator = entry.runtime_data
         self._power_sensor = entry.data[CONF_POWER_SENSOR]
         self._switch_entity = entry.data[CONF_SWITCH_SENSOR]
         self._attr_name = "Robby"
         self._attr_unique_id = (
-            f"robby_lawn_mower_{self._power_sensor}_{self._switch_entity}"
+            f"{KEY_LAWN_MOWER}_{self._power_sensor}_{self._switch_entity}"
         )
-        self._power_val = 0
-        self._switch_state = False
-        self._stuck_state = False
-        self._power_available = False
-        self._switch_available = False
-        self._stuck_available = False
         self._attr_supported_features = LawnMowerEntityFeature.PAUSE
         self._attr_translation_key = "activity"
-        self.device_info = get_device_info(hass, entry)
-
-        async_track_state_change_event(
-            hass,
-            [self._power_sensor, self._switch_entity, "switch.robby_stuck"],
-            self._handle_state_change,
-        )
-
-    async def _handle_state_change(self, event):
-        await self.async_update_ha_state(True)
-
-    async def async_update_power(self):
-        """Update the power state of the lawn mower."""
-        if (power_state := self.hass.states.get(self._power_sensor)) is None:
-            self._power_available = False
-            return
-        self._power_available = power_state.state != STATE_UNAVAILABLE
-        try:
-            self._power_val = float(power_state.state)
-        except (ValueError, TypeError, AttributeError):
-            self._power_val = -1
-
-    async def async_update_switch(self):
-        """Update the switch state of the lawn mower."""
-        if (switch_state := self.hass.states.get(self._switch_entity)) is None:
-            self._switch_available = False
-            return
-        self._switch_available = switch_state.state != STATE_UNAVAILABLE
-        self._switch_state = switch_state.state == STATE_ON
-
-    async def async_update_stuck(self):
-        """Update the stuck state of the lawn mower."""
-        if (robby_stuck_state := self.hass.states.get("switch.robby_stuck")) is None:
-            self._stuck_available = False
-            return
-        self._stuck_available = robby_stuck_state.state != STATE_UNAVAILABLE
-        self._stuck_state = robby_stuck_state.state == STATE_ON
-
-    async def async_update(self):
-        """Update the state of the lawn mower based on power consumption."""
-        await self.async_update_power()
-        await self.async_update_switch()
-        await self.async_update_stuck()
-
-    @property
-    def activity(self) -> LawnMowerActivity:
-        """Return the current activity of the lawn mower."""
-        if not self._switch_state:
-            return LawnMowerActivity.ERROR
-        if self._power_val <= 0:
-            return LawnMowerActivity.ERROR
-        if self._power_val < 2:
-            if self._stuck_state:
-                return LawnMowerActivity.ERROR
-            return LawnMowerActivity.MOWING
-        if self._power_val >= 3:
-            return STATE_CHARGING
-        return LawnMowerActivity.DOCKED
-
-    @property
-    def available(self) -> bool:
-        """Return availability of lawn mower."""
-        return (
-            self._power_available
-            and self._switch_available
-            and self._stuck_available
+        self._attr_device_info = self.coordinator.device_info
+        self._async_update_attrs()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the coordinator when added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
         )
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes of the lawn mower."""
-        return {ATTR_CHARGING: self._power_val >= 3}
+    @callback
+    def _async_update_attrs(self) -> bool:
+        """Derive the state from the coordinator snapshot, return if it changed."""
+        data = self.coordinator.data
+        attributes = {ATTR_CHARGING: data.charging}
+        if (
+            data.activity == self._attr_activity
+            and data.available == self._attr_available
+            and attributes == self.extra_state_attributes
+        ):
+            return False
+
+        self._attr_activity = data.activity
+        self._attr_available = data.available
+        self._attr_extra_state_attributes = attributes
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the derived state changed."""
+        if self._async_update_attrs():
+            self.async_write_ha_state()
+            self.coordinator.metrics.state_writes += 1
 
     async def async_pause(self) -> None:
         """Pause the lawn mower."""
@@ -126,4 +85,5 @@ class RobbyLawnMowerEntity(LawnMowerEntity):
             {"entity_id": self._switch_entity},
             blocking=True,
         )
+        self.coordinator.metrics.service_calls += 1
         self.async_write_ha_state()
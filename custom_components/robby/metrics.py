@@ -0,0 +1,63 @@
+"""Hot path instrumentation for the Robby integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, deque
+from typing import Any
+
+LATENCY_WINDOW = 1000
+LATENCY_BUCKETS = (0.0001, 0.001, 0.01, 0.1)
+
+
+class RobbyMetrics:
+    """Counters and handler latencies of a Robby coordinator."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.events: Counter[str] = Counter()
+        self.dropped_events = 0
+        self.throttled_events = 0
+        self.transitions: Counter[str] = Counter()
+        self.stuck_detections: Counter[str] = Counter()
+        self.service_calls = 0
+        self.state_writes = 0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record_latency(self, seconds: float) -> None:
+        """Record how long the state change handler took."""
+        self._latencies.append(seconds)
+        self.latency_histogram[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def latency_percentiles(self) -> dict[str, float | None]:
+        """Return percentiles of the recent handler latencies in milliseconds."""
+        latencies = sorted(self._latencies)
+        if not latencies:
+            return {"p50": None, "p90": None, "p99": None}
+        return {
+            name: round(latencies[int(len(latencies) * q)] * 1000, 3)
+            for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "events": dict(self.events),
+            "dropped_events": self.dropped_events,
+            "throttled_events": self.throttled_events,
+            "transitions": dict(self.transitions),
+            "stuck_detections": dict(self.stuck_detections),
+            "service_calls": self.service_calls,
+            "state_writes": self.state_writes,
+            "latency_ms": self.latency_percentiles(),
+            "latency_histogram": {
+                **{
+                    f"<{bucket * 1000:g}ms": count
+                    for bucket, count in zip(
+                        LATENCY_BUCKETS, self.latency_histogram, strict=False
+                    )
+                },
+                f">={LATENCY_BUCKETS[-1] * 1000:g}ms": self.latency_histogram[-1],
+            },
+        }
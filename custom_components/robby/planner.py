@@ -0,0 +1,333 @@
+"""Mowing schedule planner of the Robby integration."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time, timedelta
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.const import STATE_ON
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_MIN_TEMPERATURE,
+    CONF_RAIN_SENSOR,
+    CONF_SCHEDULE_ENFORCE,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_WEEKLY_MOWING_TIME,
+    CONF_WINDOW_END,
+    CONF_WINDOW_START,
+    DEFAULT_MIN_TEMPERATURE,
+    DEFAULT_WINDOW_END,
+    DEFAULT_WINDOW_START,
+    STATE_CHARGING,
+)
+from .history import SESSION_MOWING, RobbySession
+
+if TYPE_CHECKING:
+    from .coordinator import RobbyConfigEntry, RobbyCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+BLOCKED_RAIN = "rain"
+BLOCKED_COLD = "cold"
+BLOCKED_TARGET_REACHED = "target_reached"
+
+PLANNING_HORIZON_DAYS = 7
+
+
+@dataclass(frozen=True, slots=True)
+class MowingWindow:
+    """A period in which the Robby is allowed to mow."""
+
+    start: datetime
+    end: datetime
+
+    def __contains__(self, moment: datetime) -> bool:
+        """Return if a moment falls within the window."""
+        return self.start <= moment < self.end
+
+
+def _state_float(state: State | None) -> float | None:
+    """Return the numeric value of a state, if any."""
+    if state is None:
+        return None
+    try:
+        return float(state.state)
+    except ValueError:
+        return None
+
+
+def learn_weekly_mowing_time(
+    sessions: Iterable[RobbySession], target: float | None = None
+) -> float | None:
+    """Return the average mowing time per week of the history in seconds.
+
+    At least a week of history is needed before the average is trusted. A week
+    that reached the current target was cut short by it, so the target is
+    then kept rather than lowered by its own enforcement.
+    """
+    mowing = [session for session in sessions if session.kind == SESSION_MOWING]
+    if not mowing:
+        return None
+    first = min(session.start for session in mowing)
+    span = max(session.end for session in mowing) - first
+    if span < timedelta(weeks=1):
+        return None
+    weeks: defaultdict[int, float] = defaultdict(float)
+    for session in mowing:
+        weeks[(session.end - first) // timedelta(weeks=1)] += (
+            session.duration.total_seconds()
+        )
+    average = sum(weeks.values()) / (span / timedelta(weeks=1))
+    if target is not None and max(weeks.values()) >= target:
+        return max(average, target)
+    return average
+
+
+class RobbyMowingPlanner:
+    """Plan the mowing windows of a Robby and optionally enforce them.
+
+    A window is planned in the daily time range of the options, unless it
+    rains, it is too cold for the grass to grow, or the weekly mowing time
+    has already been reached. The weekly mowing time is an option, or
+    learned from the session history. The plan is re-evaluated on changes
+    of the lawn mower state, closed sessions, changes of the weather sensors
+    and at the boundaries of the window, never by polling.
+    """
+
+    def __init__(self, coordinator: RobbyCoordinator) -> None:
+        """Initialize the planner."""
+        self.coordinator = coordinator
+        self.hass: HomeAssistant = coordinator.hass
+        self.entry = coordinator.entry
+        self.window: MowingWindow | None = None
+        self.blocked: str | None = None
+        self.learned_weekly_mowing_time: float | None = None
+        self._enforced: bool | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_weather: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for changes of the plan."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_start(self) -> None:
+        """Plan the first window and re-plan on changes."""
+        coordinator = self.coordinator
+        self.entry.async_on_unload(
+            coordinator.async_add_transition_listener(self.async_handle_transition)
+        )
+        self.entry.async_on_unload(
+            coordinator.async_add_session_listener(self._async_handle_sessions)
+        )
+        self.entry.async_on_unload(self.async_stop)
+        self._async_track_weather()
+        self._async_handle_sessions()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the boundary timer and the weather subscription."""
+        self._async_cancel_timer()
+        if self._unsub_weather is not None:
+            self._unsub_weather()
+            self._unsub_weather = None
+
+    @callback
+    def async_handle_transition(
+        self, old_state: str | None, new_state: str | None
+    ) -> None:
+        """Re-plan after a change of the lawn mower state."""
+        self._async_evaluate()
+
+    async def async_update_options(
+        self, hass: HomeAssistant, entry: RobbyConfigEntry
+    ) -> None:
+        """Re-plan with the changed options."""
+        self._async_track_weather()
+        self._async_evaluate()
+
+    @callback
+    def _async_handle_sessions(self) -> None:
+        """Re-plan and re-learn after a change of the session aggregates."""
+        self._async_evaluate()
+        self.entry.async_create_background_task(
+            self.hass, self._async_learn(), "robby_planner_learn"
+        )
+
+    async def _async_learn(self) -> None:
+        """Learn the weekly mowing time from the session history."""
+        sessions = await self.coordinator.history.async_get_sessions()
+        learned = learn_weekly_mowing_time(sessions, self.learned_weekly_mowing_time)
+        if learned != self.learned_weekly_mowing_time:
+            self.learned_weekly_mowing_time = learned
+            self._async_evaluate()
+
+    @callback
+    def _async_track_weather(self) -> None:
+        """Subscribe to the weather sensors of the options."""
+        if self._unsub_weather is not None:
+            self._unsub_weather()
+            self._unsub_weather = None
+        options = self.entry.options
+        if entity_ids := [
+            entity_id
+            for entity_id in (
+                options.get(CONF_RAIN_SENSOR),
+                options.get(CONF_TEMPERATURE_SENSOR),
+            )
+            if entity_id
+        ]:
+            self._unsub_weather = async_track_state_change_event(
+                self.hass, entity_ids, self._async_handle_weather
+            )
+
+    @callback
+    def _async_handle_weather(self, event: Event[EventStateChangedData]) -> None:
+        """Re-plan after a change of the weather."""
+        self._async_evaluate()
+
+    def _weekly_mowing_time(self) -> float | None:
+        """Return the targeted mowing time per week in seconds."""
+        if hours := self.entry.options.get(CONF_WEEKLY_MOWING_TIME):
+            return hours * 3600
+        return self.learned_weekly_mowing_time
+
+    def _blocked_reason(self, now: datetime) -> str | None:
+        """Return why mowing is not allowed today, if it is not."""
+        options = self.entry.options
+        if rain_sensor := options.get(CONF_RAIN_SENSOR):
+            state = self.hass.states.get(rain_sensor)
+            if state is not None and (
+                state.state == STATE_ON or (_state_float(state) or 0) > 0
+            ):
+                return BLOCKED_RAIN
+        if temperature_sensor := options.get(CONF_TEMPERATURE_SENSOR):
+            temperature = _state_float(self.hass.states.get(temperature_sensor))
+            if temperature is not None and temperature < options.get(
+                CONF_MIN_TEMPERATURE, DEFAULT_MIN_TEMPERATURE
+            ):
+                return BLOCKED_COLD
+        if (target := self._weekly_mowing_time()) is not None:
+            mowed = self.coordinator.aggregates.week.mowing_time
+            cycle = self.coordinator.cycle
+            if cycle.mowing and cycle.mowing_start is not None:
+                mowed += (now - cycle.mowing_start).total_seconds()
+            if mowed >= target:
+                return BLOCKED_TARGET_REACHED
+        return None
+
+    def _plan(self, now: datetime, blocked: str | None) -> MowingWindow | None:
+        """Return the current or next window in which mowing is allowed."""
+        options = self.entry.options
+        start_time = dt_util.parse_time(
+            options.get(CONF_WINDOW_START, DEFAULT_WINDOW_START)
+        ) or dt_time(0)
+        end_time = dt_util.parse_time(
+            options.get(CONF_WINDOW_END, DEFAULT_WINDOW_END)
+        ) or dt_time(0)
+        today = now.date()
+        for days in range(PLANNING_HORIZON_DAYS + 1):
+            day = today + timedelta(days=days)
+            start = datetime.combine(day, start_time, now.tzinfo)
+            end = datetime.combine(day, end_time, now.tzinfo)
+            if end <= start:
+                end += timedelta(days=1)
+            # What blocks mowing now only holds for the window of today.
+            if end <= now or (blocked is not None and start.date() <= today):
+                continue
+            return MowingWindow(start, end)
+        return None
+
+    @callback
+    def _async_evaluate(self) -> None:
+        """Re-plan, enforce the plan and arm the next boundary."""
+        now = dt_util.now()
+        blocked = self._blocked_reason(now)
+        window = self._plan(now, blocked)
+        if window != self.window or blocked != self.blocked:
+            _LOGGER.debug(
+                "%s plans %s (blocked: %s)", self.entry.title, window, blocked
+            )
+            self.window = window
+            self.blocked = blocked
+            for update_callback in list(self._listeners):
+                update_callback()
+
+        if self.entry.options.get(CONF_SCHEDULE_ENFORCE):
+            self._async_enforce(window is not None and now in window)
+        else:
+            self._enforced = None
+
+        self._async_cancel_timer()
+        if window is not None:
+            boundary = window.start if now < window.start else window.end
+        else:
+            boundary = datetime.combine(
+                now.date() + timedelta(days=1), dt_time(0), now.tzinfo
+            )
+        self._unsub_timer = async_call_later(
+            self.hass,
+            max((boundary - now).total_seconds(), 0),
+            self._async_handle_timer,
+        )
+
+    @callback
+    def _async_enforce(self, allowed: bool) -> None:
+        """Switch the Robby on or off when the plan changed.
+
+        The switch is only commanded when the plan changes, so it can still be
+        operated manually within a window. A mowing or charging Robby is never
+        switched off; this is retried on its next transition, until it docks.
+        """
+        if allowed == self._enforced:
+            return
+        data = self.coordinator.data
+        if not allowed and data.activity in (
+            LawnMowerActivity.MOWING,
+            STATE_CHARGING,
+        ):
+            return
+        self._enforced = allowed
+        if not data.switch_available or data.switch_on == allowed:
+            return
+        self.coordinator.async_turn_switch(allowed, "the schedule")
+
+    @callback
+    def _async_handle_timer(self, now: datetime) -> None:
+        """Re-plan at a boundary of the window."""
+        self._unsub_timer = None
+        self._async_evaluate()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the boundary timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
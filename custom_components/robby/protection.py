@@ -0,0 +1,215 @@
+"""Smart plug protection of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_IDLE_CUT_TIME,
+    CONF_POWER_CUT,
+    DEFAULT_IDLE_CUT_TIME,
+    DOMAIN,
+    POWER_RESTORE_LEAD,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import RobbyConfigEntry, RobbyCoordinator
+
+STORAGE_VERSION = 1
+
+
+class RobbyPlugProtection:
+    """Cut the power of an idle dock and restore it before mowing.
+
+    Once the Robby is docked with a full battery, or has been docked for the
+    idle time, the switch is turned off. It is turned back on shortly before
+    the next planned mowing window. Nothing is cut within a window, so a cut
+    that falls in one waits for its end. Only a power cut made by the
+    protection is ever restored, which is remembered across restarts.
+    """
+
+    def __init__(self, coordinator: RobbyCoordinator) -> None:
+        """Initialize the protection."""
+        self.coordinator = coordinator
+        self.hass: HomeAssistant = coordinator.hass
+        self.entry = coordinator.entry
+        self.cut = False
+        self._store: Store[dict[str, Any]] = Store(
+            self.hass, STORAGE_VERSION, storage_key(self.entry.entry_id)
+        )
+        self._unsub_cut: CALLBACK_TYPE | None = None
+        self._unsub_restore: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Load the power cut that outlived a restart."""
+        if (data := await self._store.async_load()) is not None:
+            self.cut = data["cut"]
+
+    @callback
+    def async_start(self) -> None:
+        """Arm the protection and follow the state and plan of the Robby."""
+        coordinator = self.coordinator
+        self.entry.async_on_unload(
+            coordinator.async_add_transition_listener(self.async_handle_transition)
+        )
+        self.entry.async_on_unload(
+            coordinator.planner.async_add_listener(self._async_handle_plan)
+        )
+        self.entry.async_on_unload(self.async_stop)
+        self.entry.async_on_unload(self._async_save)
+        # A cut power that was turned back on meanwhile is no longer ours.
+        if self.cut and coordinator.data.switch_on:
+            self._async_set_cut(False)
+        self._async_handle_plan()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the pending power cut and restore."""
+        self._async_cancel_cut()
+        if self._unsub_restore is not None:
+            self._unsub_restore()
+            self._unsub_restore = None
+
+    @callback
+    def async_handle_transition(
+        self, old_state: str | None, new_state: str | None
+    ) -> None:
+        """Arm or cancel the power cut after a change of the lawn mower state."""
+        if self.cut and self.coordinator.data.switch_on:
+            # The power was restored by someone else.
+            self._async_set_cut(False)
+            self._async_schedule_restore()
+        self._async_schedule_cut()
+
+    async def async_update_options(
+        self, hass: HomeAssistant, entry: RobbyConfigEntry
+    ) -> None:
+        """Re-arm the protection with the changed options."""
+        if not self._enabled and self.cut:
+            self._async_set_cut(False)
+        self._async_handle_plan()
+
+    @property
+    def _enabled(self) -> bool:
+        """Return if the power cut is enabled in the options."""
+        return bool(self.entry.options.get(CONF_POWER_CUT))
+
+    @callback
+    def _async_set_cut(self, cut: bool) -> None:
+        """Remember if the power is cut by the protection."""
+        self.cut = cut
+        self._store.async_delay_save(self._data_to_save)
+
+    async def _async_save(self) -> None:
+        """Write the power cut now instead of after the save delay."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"cut": self.cut}
+
+    @callback
+    def _async_handle_plan(self) -> None:
+        """Re-arm the power cut and the restore after a change of the plan."""
+        self._async_schedule_cut()
+        self._async_schedule_restore()
+
+    @callback
+    def _async_schedule_cut(self) -> None:
+        """Arm the power cut when the Robby is docked."""
+        self._async_cancel_cut()
+        coordinator = self.coordinator
+        data = coordinator.data
+        if (
+            not self._enabled
+            or data.activity != LawnMowerActivity.DOCKED
+            or not data.switch_on
+        ):
+            return
+
+        now = dt_util.utcnow()
+        battery_level = coordinator.battery.level
+        if battery_level is not None and battery_level >= 100:
+            cut_at = now
+        elif (
+            idle_time := self.entry.options.get(
+                CONF_IDLE_CUT_TIME, DEFAULT_IDLE_CUT_TIME
+            )
+        ) and (docked_since := coordinator.classifier.activity_since) is not None:
+            cut_at = dt_util.utc_from_timestamp(docked_since) + timedelta(
+                minutes=idle_time
+            )
+        else:
+            return
+        # Nothing is cut within a window, so the cut waits for its end.
+        if (window := coordinator.planner.window) is not None and cut_at in window:
+            cut_at = window.end
+        self._unsub_cut = async_call_later(
+            self.hass,
+            max((cut_at - now).total_seconds(), 0),
+            self._async_handle_cut,
+        )
+
+    @callback
+    def _async_cancel_cut(self) -> None:
+        """Cancel the pending power cut."""
+        if self._unsub_cut is not None:
+            self._unsub_cut()
+            self._unsub_cut = None
+
+    @callback
+    def _async_handle_cut(self, now: datetime) -> None:
+        """Cut the power of the idle dock."""
+        self._unsub_cut = None
+        data = self.coordinator.data
+        if data.activity != LawnMowerActivity.DOCKED or not data.switch_on:
+            return
+        if (window := self.coordinator.planner.window) is not None and now in window:
+            self._async_schedule_cut()
+            return
+        self._async_set_cut(True)
+        self.coordinator.async_turn_switch(False, "the plug protection")
+        self._async_schedule_restore()
+
+    @callback
+    def _async_schedule_restore(self) -> None:
+        """Arm the restore before the next planned window."""
+        if self._unsub_restore is not None:
+            self._unsub_restore()
+            self._unsub_restore = None
+        if not self.cut or (window := self.coordinator.planner.window) is None:
+            return
+        restore = window.start - timedelta(seconds=POWER_RESTORE_LEAD)
+        self._unsub_restore = async_call_later(
+            self.hass,
+            max((restore - dt_util.now()).total_seconds(), 0),
+            self._async_handle_restore,
+        )
+
+    @callback
+    def _async_handle_restore(self, now: datetime) -> None:
+        """Restore the power before the planned window."""
+        self._unsub_restore = None
+        if not self.cut:
+            return
+        self._async_set_cut(False)
+        if not self.coordinator.data.switch_on:
+            self.coordinator.async_turn_switch(True, "the plug protection")
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of the plug protection of a config entry."""
+    return f"{DOMAIN}.protection.{entry_id}"
+
+
+async def async_remove_protection(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored plug protection of a config entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry_id)).async_remove()
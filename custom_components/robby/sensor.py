@@ -0,0 +1,286 @@
+"""Robby sensor Entities for Home Assistant."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from . import RobbyConfigEntry
+from .const import (
+    CONF_POWER_SENSOR,
+    CONF_SWITCH_SENSOR,
+    KEY_AVERAGE_MOWING_TIME,
+    KEY_AVERAGE_POWER,
+    KEY_BATTERY_LEVEL,
+    KEY_CHARGE_TO_MOW_RATIO,
+    KEY_MOWING_SESSIONS_WEEK,
+    KEY_MOWING_TIME_DAY,
+    KEY_MOWING_TIME_WEEK,
+    KEY_NEXT_WINDOW_END,
+    KEY_NEXT_WINDOW_START,
+    KEY_SESSION_ENERGY,
+    KEY_TIME_TO_FULL,
+    KEY_TOTAL_ENERGY,
+)
+from .coordinator import RobbyCoordinator
+
+
+def _set_total_energy(coordinator: RobbyCoordinator, value: float) -> None:
+    """Continue the cumulative charging energy from its restored value."""
+    coordinator.energy.total_energy = value
+
+
+def _session_start(coordinator: RobbyCoordinator) -> datetime | None:
+    """Return the start of the current or last charging session."""
+    if (session_start := coordinator.energy.session_start) is None:
+        return None
+    return dt_util.utc_from_timestamp(session_start)
+
+
+def _set_battery_level(coordinator: RobbyCoordinator, value: float) -> None:
+    """Continue the battery level estimate from its restored value."""
+    coordinator.battery.level = value
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    """Round a value that may be unknown."""
+    return None if value is None else round(value, digits)
+
+
+def _per_minute(seconds: float | None) -> float | None:
+    """Convert a duration that may be unknown to minutes."""
+    return None if seconds is None else seconds / 60
+
+
+@dataclass(frozen=True, kw_only=True)
+class RobbySensorEntityDescription(SensorEntityDescription):
+    """Describes a Robby sensor entity."""
+
+    value_fn: Callable[[RobbyCoordinator], float | datetime | None]
+    last_reset_fn: Callable[[RobbyCoordinator], datetime | None] | None = None
+    restore_fn: Callable[[RobbyCoordinator, float], None] | None = None
+    on_session_close: bool = False
+    on_plan_change: bool = False
+
+
+ENTITIES: tuple[RobbySensorEntityDescription, ...] = (
+    RobbySensorEntityDescription(
+        key=KEY_SESSION_ENERGY,
+        name="Robby charging session energy",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL,
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        value_fn=lambda coordinator: round(coordinator.energy.session_energy, 1),
+        last_reset_fn=_session_start,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_TOTAL_ENERGY,
+        name="Robby charging energy",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        value_fn=lambda coordinator: round(coordinator.energy.total_energy, 1),
+        restore_fn=_set_total_energy,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_AVERAGE_POWER,
+        name="Robby average charging power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        value_fn=lambda coordinator: _round(coordinator.energy.average_power, 1),
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_BATTERY_LEVEL,
+        name="Robby battery level",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda coordinator: _round(coordinator.battery.level, 0),
+        restore_fn=_set_battery_level,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_TIME_TO_FULL,
+        name="Robby time to full",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        value_fn=lambda coordinator: _round(
+            _per_minute(coordinator.battery.time_to_full), 0
+        ),
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_MOWING_TIME_DAY,
+        name="Robby mowing time last 24 hours",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        value_fn=lambda coordinator: round(
+            coordinator.aggregates.day.mowing_time / 60, 1
+        ),
+        on_session_close=True,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_MOWING_TIME_WEEK,
+        name="Robby mowing time last 7 days",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        value_fn=lambda coordinator: round(
+            coordinator.aggregates.week.mowing_time / 60, 1
+        ),
+        on_session_close=True,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_MOWING_SESSIONS_WEEK,
+        name="Robby mowing sessions last 7 days",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.aggregates.week.mowing_sessions,
+        on_session_close=True,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_AVERAGE_MOWING_TIME,
+        name="Robby average mowing session",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        value_fn=lambda coordinator: _round(
+            _per_minute(coordinator.aggregates.week.average_mowing_time), 1
+        ),
+        on_session_close=True,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_CHARGE_TO_MOW_RATIO,
+        name="Robby charge to mow ratio",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _round(
+            coordinator.aggregates.week.charge_to_mow_ratio, 2
+        ),
+        on_session_close=True,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_NEXT_WINDOW_START,
+        name="Robby next mowing window start",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: (
+            window.start if (window := coordinator.planner.window) else None
+        ),
+        on_plan_change=True,
+    ),
+    RobbySensorEntityDescription(
+        key=KEY_NEXT_WINDOW_END,
+        name="Robby next mowing window end",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: (
+            window.end if (window := coordinator.planner.window) else None
+        ),
+        on_plan_change=True,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: RobbyConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up the sensor entities."""
+    async_add_entities(
+        RobbySensorEntity(hass, entry, description) for description in ENTITIES
+    )
+
+
+class RobbySensorEntity(RestoreSensor):
+    """Representation of a Robby sensor derived from the power signal or sessions."""
+
+    entity_description: RobbySensorEntityDescription
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: RobbyConfigEntry,
+        description: RobbySensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor entity."""
+        self.hass = hass
+        self.coordinator = entry.runtime_data
+        self.entity_description = description
+        self._power_sensor = entry.data[CONF_POWER_SENSOR]
+        self._switch_entity = entry.data[CONF_SWITCH_SENSOR]
+        self._attr_unique_id = (
+            f"{description.key}_{self._power_sensor}_{self._switch_entity}"
+        )
+        self._attr_device_info = self.coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last value and subscribe to the coordinator."""
+        await super().async_added_to_hass()
+
+        if (restore_fn := self.entity_description.restore_fn) is not None and (
+            last_data := await self.async_get_last_sensor_data()
+        ) is not None:
+            try:
+                restore_fn(self.coordinator, float(last_data.native_value))
+            except (TypeError, ValueError):
+                pass
+
+        self._async_update_attrs()
+        if self.entity_description.on_session_close:
+            self.async_on_remove(
+                self.coordinator.async_add_session_listener(
+                    self._handle_coordinator_update
+                )
+            )
+        elif self.entity_description.on_plan_change:
+            self.async_on_remove(
+                self.coordinator.planner.async_add_listener(
+                    self._handle_coordinator_update
+                )
+            )
+        else:
+            self.async_on_remove(
+                self.coordinator.async_add_listener(self._handle_coordinator_update)
+            )
+
+    @callback
+    def _async_update_attrs(self) -> bool:
+        """Derive the value from the coordinator, return if it changed."""
+        coordinator = self.coordinator
+        description = self.entity_description
+        value = description.value_fn(coordinator)
+        last_reset = (
+            description.last_reset_fn(coordinator)
+            if description.last_reset_fn
+            else None
+        )
+        if value == self._attr_native_value and last_reset == self.last_reset:
+            return False
+
+        self._attr_native_value = value
+        self._attr_last_reset = last_reset
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the value changed."""
+        if self._async_update_attrs():
+            self.async_write_ha_state()
+            self.coordinator.metrics.state_writes += 1
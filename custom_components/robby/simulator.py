@@ -0,0 +1,163 @@
+"""Simulated power sensor and switch of the Robby integration."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    STATE_ON,
+    UnitOfPower,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import STATE_CHARGING
+
+_LOGGER = logging.getLogger(__name__)
+
+SIMULATOR_TICK = timedelta(milliseconds=100)
+SIMULATOR_MOWING_POWER = 1.0
+SIMULATOR_DOCKED_POWER = 2.5
+SIMULATOR_CHARGING_POWER = 20.0
+SIMULATOR_MIN_POWER = 0.05
+
+
+@dataclass(frozen=True, slots=True)
+class SimulatorConfig:
+    """Schedule, noise and speed of a simulated Robby."""
+
+    speed_up: float = 60.0
+    samples_per_second: float = 1.0
+    mowing_time: float = 60.0
+    charging_time: float = 45.0
+    docked_time: float = 15.0
+    noise: float = 0.1
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> SimulatorConfig:
+        """Create the configuration from the data of a config entry."""
+        return cls(
+            **{
+                key: float(data.get(key, default))
+                for key, default in asdict(cls()).items()
+            }
+        )
+
+
+class RobbySimulator:
+    """Write the states of a fake power sensor behind a simulated switch.
+
+    The Robby repeatedly mows, charges and idles in the dock for the
+    configured number of minutes, compressed by the speed-up, and draws no
+    power while the switch entity is off. Samples are written in batches on
+    every tick, so thousands of samples per second can be generated. Dwell
+    times and the sample interval are not sped up, as the state changes
+    carry the real time they were fired.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        power_sensor: str,
+        switch_entity: str,
+        config: SimulatorConfig,
+    ) -> None:
+        """Initialize the simulator."""
+        self.hass = hass
+        self.power_sensor = power_sensor
+        self.switch_entity = switch_entity
+        self.config = config
+        self.samples = 0
+        self._random = random.Random()
+        self._started = 0.0
+        self._pending_samples = 0.0
+        self._last_tick = 0.0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._schedule = (
+            (LawnMowerActivity.MOWING, config.mowing_time * 60),
+            (STATE_CHARGING, config.charging_time * 60),
+            (LawnMowerActivity.DOCKED, config.docked_time * 60),
+        )
+        self._period = sum(duration for _, duration in self._schedule)
+
+    @callback
+    def async_start(self) -> None:
+        """Write the initial power and start generating samples."""
+        self._started = self._last_tick = time.monotonic()
+        self._async_write_power(self._started)
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_tick, SIMULATOR_TICK
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop generating samples and remove the simulated power."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self.hass.states.async_remove(self.power_sensor)
+        _LOGGER.debug(
+            "Simulator %s wrote %s samples", self.power_sensor, self.samples
+        )
+
+    def power(self, elapsed: float) -> float:
+        """Return the power after the given number of simulated seconds."""
+        offset = elapsed % self._period if self._period else 0.0
+        activity, progress = LawnMowerActivity.DOCKED, 0.0
+        for activity, duration in self._schedule:
+            if offset < duration:
+                progress = offset / duration
+                break
+            offset -= duration
+
+        if activity == LawnMowerActivity.MOWING:
+            power = SIMULATOR_MOWING_POWER
+        elif activity == STATE_CHARGING:
+            # The charging power tapers off as the battery fills up.
+            power = SIMULATOR_CHARGING_POWER * (1 - 0.6 * progress)
+        else:
+            power = SIMULATOR_DOCKED_POWER
+        power += self._random.gauss(0, self.config.noise)
+        return max(power, SIMULATOR_MIN_POWER)
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Write the samples that are due since the previous tick."""
+        tick = time.monotonic()
+        self._pending_samples += (tick - self._last_tick) * (
+            self.config.samples_per_second
+        )
+        self._last_tick = tick
+        for _ in range(int(self._pending_samples)):
+            self._async_write_power(tick)
+        self._pending_samples %= 1
+
+    @callback
+    def _async_write_power(self, tick: float) -> None:
+        """Write one power sample."""
+        switch = self.hass.states.get(self.switch_entity)
+        if switch is not None and switch.state != STATE_ON:
+            power = 0.0
+        else:
+            power = self.power((tick - self._started) * self.config.speed_up)
+        self.samples += 1
+        self.hass.states.async_set(
+            self.power_sensor,
+            f"{power:.2f}",
+            {
+                ATTR_DEVICE_CLASS: SensorDeviceClass.POWER,
+                ATTR_UNIT_OF_MEASUREMENT: UnitOfPower.WATT,
+            },
+            # Identical consecutive values must still reach the classifier.
+            force_update=True,
+        )
@@ -0,0 +1,278 @@
+"""Long-term statistics of the Robby integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import partial
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import (
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfEnergy,
+    UnitOfTime,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_RETENTION,
+    KEY_LAWN_MOWER,
+    STATE_CHARGING,
+    STATISTICS_FLUSH_DELAY,
+)
+from .history import SESSION_CHARGING, SESSION_MOWING, RobbySession
+
+if TYPE_CHECKING:
+    from .coordinator import RobbyCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STAT_MOWING_TIME = "mowing_time"
+STAT_MOWING_SESSIONS = "mowing_sessions"
+STAT_CHARGE_ENERGY = "charge_energy"
+
+type _ValueFn = Callable[[RobbySession], float]
+
+
+def _mowing_time(session: RobbySession) -> float:
+    """Return the mowing hours a session adds."""
+    if session.kind != SESSION_MOWING:
+        return 0.0
+    return session.duration.total_seconds() / 3600
+
+
+def _mowing_sessions(session: RobbySession) -> float:
+    """Return the mowing sessions a session adds."""
+    return 1.0 if session.kind == SESSION_MOWING else 0.0
+
+
+def _charge_energy(session: RobbySession) -> float:
+    """Return the charged energy a session adds."""
+    if session.kind != SESSION_CHARGING:
+        return 0.0
+    return session.energy or 0.0
+
+
+# Statistic, name suffix, unit and the value a session adds to it.
+_STATISTICS: tuple[tuple[str, str, str | None, _ValueFn], ...] = (
+    (STAT_MOWING_TIME, "mowing time", UnitOfTime.HOURS, _mowing_time),
+    (STAT_MOWING_SESSIONS, "mowing sessions", None, _mowing_sessions),
+    (STAT_CHARGE_ENERGY, "charge energy", UnitOfEnergy.WATT_HOUR, _charge_energy),
+)
+
+
+def _hour(moment: datetime) -> datetime:
+    """Return the start of the hour of a moment in UTC."""
+    return dt_util.as_utc(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def reconstruct_sessions(states: Iterable[State]) -> list[RobbySession]:
+    """Reconstruct the mowing and charging sessions from lawn mower states.
+
+    The cycles are opened and closed like the cycle tracker does: an error
+    does not end a mowing session, and a session that ends during a gap is
+    closed when the gap started.
+    """
+    sessions: list[RobbySession] = []
+    mowing_start: datetime | None = None
+    charging_start: datetime | None = None
+    gap_start: datetime | None = None
+    for state in states:
+        activity = state.state
+        if activity in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            if gap_start is None:
+                gap_start = state.last_changed
+            continue
+        end = gap_start or state.last_changed
+        gap_start = None
+        if mowing_start is not None and activity in (
+            LawnMowerActivity.DOCKED,
+            STATE_CHARGING,
+        ):
+            sessions.append(RobbySession(SESSION_MOWING, mowing_start, end))
+            mowing_start = None
+        if charging_start is not None and activity != STATE_CHARGING:
+            sessions.append(RobbySession(SESSION_CHARGING, charging_start, end))
+            charging_start = None
+        if activity == LawnMowerActivity.MOWING and mowing_start is None:
+            mowing_start = state.last_changed
+        elif activity == STATE_CHARGING and charging_start is None:
+            charging_start = state.last_changed
+    return sessions
+
+
+class RobbyStatistics:
+    """Import the closed sessions of a Robby as external statistics.
+
+    Sessions are added to hourly sums in memory and written to the recorder
+    in one batch shortly after they close. When no statistics exist yet, the
+    sessions are first reconstructed once from the recorder history of the
+    lawn mower entity.
+    """
+
+    def __init__(self, coordinator: RobbyCoordinator) -> None:
+        """Initialize the statistics."""
+        self.coordinator = coordinator
+        self.hass: HomeAssistant = coordinator.hass
+        entry = coordinator.entry
+        self.metadata: dict[str, StatisticMetaData] = {
+            key: StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=f"{entry.title} {name}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{entry.entry_id.lower()}_{key}",
+                unit_of_measurement=unit,
+            )
+            for key, name, unit, _ in _STATISTICS
+        }
+        self._last: dict[str, tuple[datetime, float]] | None = None
+        self._loading: list[RobbySession] = []
+        self._pending: dict[str, dict[datetime, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._load_task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Load the last sums in the background, backfilling them if needed."""
+        if "recorder" not in self.hass.config.components:
+            return
+        self.coordinator.entry.async_on_unload(self.async_stop)
+        self._load_task = self.coordinator.entry.async_create_background_task(
+            self.hass, self._async_load(), "robby_statistics_load"
+        )
+
+    async def async_stop(self) -> None:
+        """Finish loading the last sums, then write the pending sums.
+
+        Sessions that closed while loading are only added once the load is
+        done, so the load is awaited rather than cancelled on unload.
+        """
+        if self._load_task is not None and not self._load_task.done():
+            await self._load_task
+        self._async_flush()
+
+    @callback
+    def async_add_session(self, session: RobbySession) -> None:
+        """Add a closed session and schedule a batched write."""
+        if "recorder" not in self.hass.config.components:
+            return
+        if self._last is None:
+            self._loading.append(session)
+            return
+        self._add(session)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, STATISTICS_FLUSH_DELAY, self._async_handle_flush
+            )
+
+    def _add(self, session: RobbySession) -> None:
+        """Add a session to the pending hourly sums."""
+        hour = _hour(session.end)
+        for key, _, _, value_fn in _STATISTICS:
+            if value := value_fn(session):
+                self._pending[key][hour] += value
+
+    async def _async_load(self) -> None:
+        """Load the last sums, and backfill them when there are none."""
+        recorder = get_instance(self.hass)
+        cutoff = dt_util.utcnow()
+        last: dict[str, tuple[datetime, float]] = {}
+        for key, metadata in self.metadata.items():
+            statistic_id = metadata["statistic_id"]
+            rows = await recorder.async_add_executor_job(
+                get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+            )
+            if row := next(iter(rows.get(statistic_id, ())), None):
+                start = dt_util.utc_from_timestamp(row["start"])
+                last[key] = (start, row["sum"] or 0.0)
+
+        sessions = self._loading
+        if not last:
+            for session in await self._async_reconstruct(cutoff):
+                self._add(session)
+            # The backfill already holds the sessions that closed before it.
+            sessions = [session for session in sessions if session.end >= cutoff]
+        for session in sessions:
+            self._add(session)
+
+        self._loading = []
+        self._last = last
+        self._async_flush()
+
+    async def _async_reconstruct(self, cutoff: datetime) -> list[RobbySession]:
+        """Reconstruct the sessions until the cutoff from the recorder history."""
+        if (entity_id := self.coordinator.entity_ids.get(KEY_LAWN_MOWER)) is None:
+            return []
+        states = await get_instance(self.hass).async_add_executor_job(
+            partial(
+                history.state_changes_during_period,
+                self.hass,
+                cutoff - HISTORY_RETENTION,
+                cutoff,
+                entity_id,
+                include_start_time_state=True,
+            )
+        )
+        sessions = reconstruct_sessions(states.get(entity_id, ()))
+        _LOGGER.debug(
+            "%s backfills %s sessions from the recorder",
+            self.coordinator.entry.title,
+            len(sessions),
+        )
+        return sessions
+
+    @callback
+    def _async_handle_flush(self, now: datetime) -> None:
+        """Write the pending sums once the batch delay has passed."""
+        self._unsub_flush = None
+        self._async_flush()
+
+    @callback
+    def _async_flush(self) -> None:
+        """Write the pending sums as cumulative hourly statistics."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._last is None or not self._pending:
+            return
+
+        for key, hours in self._pending.items():
+            last_start, total = self._last.get(key, (None, 0.0))
+            statistics: list[StatisticData] = []
+            for start in sorted(hours):
+                total += hours[start]
+                # A late session is added to the last written hour.
+                if last_start is not None and start < last_start:
+                    start = last_start
+                if statistics and statistics[-1]["start"] == start:
+                    statistics[-1]["sum"] = total
+                    continue
+                statistics.append(StatisticData(start=start, sum=total))
+                last_start = start
+            if statistics:
+                self._last[key] = (statistics[-1]["start"], total)
+                async_add_external_statistics(
+                    self.hass, self.metadata[key], statistics
+                )
+        self._pending.clear()
@@ -0,0 +1,128 @@
+"""Stuck detection of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_STUCK_REASON,
+    CONF_MAX_MOWING_TIME,
+    CONF_STUCK_POWER_TIME,
+    DEFAULT_MAX_MOWING_TIME,
+    DEFAULT_STUCK_POWER_TIME,
+    KEY_STUCK,
+    STUCK_REASON_MAX_MOWING_TIME,
+    STUCK_REASON_NO_POWER,
+)
+from .coordinator import RobbyConfigEntry, RobbyCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RobbyStuckDetector:
+    """Detect a stuck Robby from its cycles and power signature.
+
+    A Robby is considered stuck once it has been mowing for longer than the
+    maximum mowing time, or once the power has stayed at zero for the stuck
+    power time while the switch is on. A single timer is armed for the
+    earliest deadline and re-armed on every change of the lawn mower state.
+    """
+
+    def __init__(self, coordinator: RobbyCoordinator) -> None:
+        """Initialize the stuck detector."""
+        self.coordinator = coordinator
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Arm the detection for the restored state."""
+        self._async_schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the pending detection."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def async_handle_transition(
+        self, old_state: str | None, new_state: str | None
+    ) -> None:
+        """Re-arm the detection after a change of the lawn mower state."""
+        self._async_schedule()
+
+    async def async_update_options(
+        self, hass: HomeAssistant, entry: RobbyConfigEntry
+    ) -> None:
+        """Re-arm the detection with the changed options."""
+        self._async_schedule()
+
+    def _deadline(self) -> tuple[datetime, str] | None:
+        """Return when and why the Robby is considered stuck, if ever."""
+        coordinator = self.coordinator
+        data = coordinator.data
+        if data.stuck or not data.available or not data.switch_on:
+            return None
+
+        options = coordinator.entry.options
+        if data.activity == LawnMowerActivity.MOWING:
+            max_mowing_time = options.get(CONF_MAX_MOWING_TIME, DEFAULT_MAX_MOWING_TIME)
+            if not max_mowing_time or (start := coordinator.cycle.mowing_start) is None:
+                return None
+            return start + timedelta(minutes=max_mowing_time), (
+                STUCK_REASON_MAX_MOWING_TIME
+            )
+
+        # With the switch on and the power known, an error can only come from
+        # the power at zero. A power of unknown makes the Robby unavailable.
+        if data.activity == LawnMowerActivity.ERROR:
+            stuck_power_time = options.get(
+                CONF_STUCK_POWER_TIME, DEFAULT_STUCK_POWER_TIME
+            )
+            if not stuck_power_time or (
+                since := coordinator.classifier.activity_since
+            ) is None:
+                return None
+            return dt_util.utc_from_timestamp(since) + timedelta(
+                seconds=stuck_power_time
+            ), STUCK_REASON_NO_POWER
+
+        return None
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Arm the timer for the current deadline."""
+        self.async_stop()
+        if (deadline := self._deadline()) is None:
+            return
+        self._unsub_timer = async_call_later(
+            self.coordinator.hass,
+            max((deadline[0] - dt_util.utcnow()).total_seconds(), 0),
+            self._async_handle_timer,
+        )
+
+    @callback
+    def _async_handle_timer(self, now: datetime) -> None:
+        """Mark the Robby as stuck once its deadline has passed."""
+        self._unsub_timer = None
+        if (deadline := self._deadline()) is None:
+            return
+        if deadline[0] > now:
+            self._async_schedule()
+            return
+
+        reason = deadline[1]
+        _LOGGER.warning(
+            "%s is considered stuck: %s", self.coordinator.entry.title, reason
+        )
+        self.coordinator.metrics.stuck_detections[reason] += 1
+        self.coordinator.async_apply_cycle_changes(
+            {KEY_STUCK: True, ATTR_STUCK_REASON: reason}
+        )
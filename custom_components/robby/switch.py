@@ -1,14 +1,22 @@
 """Robby switch Entity for Home Assistant."""
 
+from typing import Any
+
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.const import STATE_ON
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from . import RobbyConfigEntry
-from .const import CONF_POWER_SENSOR, CONF_SWITCH_SENSOR
-from .device_binding import get_device_info
+from .const import (
+    ATTR_STUCK_REASON,
+    CONF_POWER_SENSOR,
+    CONF_SIMULATOR,
+    CONF_SWITCH_SENSOR,
+    KEY_STUCK,
+    STUCK_REASON_MANUAL,
+)
 
 
 async def async_setup_entry(
@@ -17,8 +25,10 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up the lawn mower entity."""
-    stuck_switch = RobbyStuckSwitchEntity(hass, entry)
-    async_add_entities([stuck_switch], update_before_add=True)
+    entities: list[SwitchEntity] = [RobbyStuckSwitchEntity(hass, entry)]
+    if CONF_SIMULATOR in entry.data:
+        entities.append(RobbySimulatorSwitchEntity(entry))
+    async_add_entities(entities)
 
 
 class RobbyStuckSwitchEntity(SwitchEntity, RestoreEntity):
@@ -32,32 +42,76 @@ class RobbyStuckSwitchEntity(SwitchEntity, RestoreEntity):
         self._switch_entity = entry.data[CONF_SWITCH_SENSOR]
         self._attr_name = "Robby stuck"
         self._attr_unique_id = (
-            f"robby_stuck_switch_{self._power_sensor}_{self._switch_entity}"
+            f"{KEY_STUCK}_{self._power_sensor}_{self._switch_entity}"
         )
-        self._state = None
-        self.device_info = get_device_info(hass, entry)
+        self.coordinator = entry.runtime_data
+        self._attr_device_info = self.coordinator.device_info
 
     @property
-    def state(self):
+    def is_on(self) -> bool:
         """Return the state of the switch."""
-        return self._state
+        return self.coordinator.cycle.stuck
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return why the Robby is considered stuck."""
+        if not self.coordinator.cycle.stuck:
+            return None
+        return {ATTR_STUCK_REASON: self.coordinator.cycle.stuck_reason}
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
         await super().async_added_to_hass()
 
         state = await self.async_get_last_state()
-        if not state:
-            self._state = STATE_OFF
-        else:
-            self._state = state.state
+        stuck = state is not None and state.state == STATE_ON
+        self.coordinator.async_apply_cycle_changes(
+            {
+                KEY_STUCK: stuck,
+                ATTR_STUCK_REASON: state.attributes.get(ATTR_STUCK_REASON)
+                if stuck
+                else None,
+            }
+        )
+
+        self.async_on_remove(
+            self.coordinator.async_add_tracked_entity(KEY_STUCK, self)
+        )
 
     async def async_turn_on(self, **kwargs):
         """Turn on the switch."""
-        self._state = STATE_ON
-        self.async_write_ha_state()
+        self.coordinator.async_apply_cycle_changes(
+            {KEY_STUCK: True, ATTR_STUCK_REASON: STUCK_REASON_MANUAL}
+        )
 
     async def async_turn_off(self, **kwargs):
         """Turn off the switch."""
-        self._state = STATE_OFF
+        self.coordinator.async_apply_cycle_changes(
+            {KEY_STUCK: False, ATTR_STUCK_REASON: None}
+        )
+
+
+class RobbySimulatorSwitchEntity(SwitchEntity):
+    """Representation of the simulated smart plug of a Robby.
+
+    The simulator reads the state of this switch, so turning it off cuts the
+    simulated power like a real plug would.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, entry: RobbyConfigEntry) -> None:
+        """Initialize the simulated switch."""
+        self.entity_id = entry.data[CONF_SWITCH_SENSOR]
+        self._attr_name = f"{entry.title} switch"
+        self._attr_is_on = True
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn on the simulated plug."""
+        self._attr_is_on = True
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn off the simulated plug."""
+        self._attr_is_on = False
         self.async_write_ha_state()
@@ -0,0 +1,281 @@
+"""Lifecycle transition table of the Robby integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import callback
+from homeassistant.helpers import restore_state
+from homeassistant.util.dt import now
+
+from .const import (
+    ATTR_STUCK_REASON,
+    EVENT_CHARGING_STARTED,
+    EVENT_MOWING_STARTED,
+    KEY_END_CHARGING_CYCLE,
+    KEY_END_MOWING_CYCLE,
+    KEY_START_CHARGING_CYCLE,
+    KEY_START_MOWING_CYCLE,
+    KEY_STUCK,
+    STATE_CHARGING,
+)
+from .coordinator import RobbyCoordinator
+from .history import (
+    OUTCOME_COMPLETED,
+    OUTCOME_INTERRUPTED,
+    OUTCOME_STUCK,
+    SESSION_CHARGING,
+    SESSION_MOWING,
+    RobbySession,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTION_START_MOWING = "start_mowing"
+ACTION_ENSURE_MOWING = "ensure_mowing"
+ACTION_STOP_MOWING = "stop_mowing"
+ACTION_START_CHARGING = "start_charging"
+ACTION_ENSURE_CHARGING = "ensure_charging"
+ACTION_STOP_CHARGING = "stop_charging"
+ACTION_RELEASE = "release"
+
+_ERROR = LawnMowerActivity.ERROR
+_MOWING = LawnMowerActivity.MOWING
+_DOCKED = LawnMowerActivity.DOCKED
+
+type TransitionRule = tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]
+type _Action = Callable[[dict[str, Any], datetime, str], None]
+
+# (old activities, new activities, ordered actions)
+TRANSITION_TABLE: tuple[TransitionRule, ...] = (
+    ((_DOCKED,), (_MOWING,), (ACTION_START_MOWING,)),
+    ((_DOCKED,), (STATE_CHARGING,), (ACTION_START_CHARGING,)),
+    ((_ERROR,), (_MOWING,), (ACTION_ENSURE_MOWING,)),
+    ((STATE_CHARGING,), (_MOWING,), (ACTION_STOP_CHARGING, ACTION_START_MOWING)),
+    ((STATE_CHARGING,), (_DOCKED, _ERROR), (ACTION_STOP_CHARGING,)),
+    ((_MOWING, _ERROR), (_DOCKED,), (ACTION_STOP_MOWING, ACTION_RELEASE)),
+    (
+        (_MOWING, _ERROR),
+        (STATE_CHARGING,),
+        (ACTION_STOP_MOWING, ACTION_RELEASE, ACTION_ENSURE_CHARGING),
+    ),
+)
+
+
+def compile_transitions(
+    table: Iterable[TransitionRule],
+) -> dict[tuple[str, str], tuple[str, ...]]:
+    """Expand the transition table into a lookup per (old, new) activity."""
+    transitions: dict[tuple[str, str], tuple[str, ...]] = {}
+    for old_activities, new_activities, actions in table:
+        for old_activity in old_activities:
+            for new_activity in new_activities:
+                transitions[old_activity, new_activity] = actions
+    return transitions
+
+
+class RobbyCycleTracker:
+    """Track the mowing and charging cycles of a Robby.
+
+    Transitions between activities are looked up in the compiled transition
+    table and their actions are applied to the cycle state in one batch.
+    After an unavailable period, and on startup, the cycle state is instead
+    reconciled with the current activity.
+    """
+
+    def __init__(self, coordinator: RobbyCoordinator) -> None:
+        """Initialize the cycle tracker."""
+        self.coordinator = coordinator
+        self.cycle = coordinator.cycle
+        self._recovering = True
+        self._unavailable_since: datetime | None = None
+        self._transitions = compile_transitions(TRANSITION_TABLE)
+        self._closed_sessions: list[RobbySession] = []
+        self._actions: dict[str, _Action] = {
+            ACTION_START_MOWING: self._start_mowing,
+            ACTION_ENSURE_MOWING: self._ensure_mowing,
+            ACTION_STOP_MOWING: self._stop_mowing,
+            ACTION_START_CHARGING: self._start_charging,
+            ACTION_ENSURE_CHARGING: self._ensure_charging,
+            ACTION_STOP_CHARGING: self._stop_charging,
+            ACTION_RELEASE: self._release,
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Reconcile the restored cycle state once the entities are set up."""
+        if self.coordinator.data.available:
+            self._async_recover(self.coordinator.data.activity)
+
+    @callback
+    def async_handle_transition(
+        self, old_state: str | None, new_state: str | None
+    ) -> None:
+        """Apply the actions of a change of the lawn mower state."""
+        if new_state in (None, STATE_UNAVAILABLE, STATE_UNKNOWN):
+            if self._unavailable_since is None:
+                self._unavailable_since = now()
+            return
+
+        if self._recovering or old_state in (None, STATE_UNAVAILABLE, STATE_UNKNOWN):
+            self._async_recover(new_state)
+            return
+
+        if not (actions := self._transitions.get((old_state, new_state))):
+            return
+
+        _LOGGER.debug(
+            "%s transitions from %s to %s: %s",
+            self.coordinator.entry.title,
+            old_state,
+            new_state,
+            ", ".join(actions),
+        )
+        changes: dict[str, Any] = {}
+        timestamp = now()
+        for action in actions:
+            self._actions[action](changes, timestamp, new_state)
+        self._async_apply(changes)
+
+    @callback
+    def _async_recover(self, activity: str) -> None:
+        """Close and open cycles to match the activity after a gap.
+
+        Cycles that ended during the gap are closed when the gap started, as
+        that is the last time they were seen, and cycles that started during
+        the gap are opened when it ended. On startup, the gap started when
+        the restored cycle state was last stored.
+        """
+        timestamp = now()
+        gap_start = self._unavailable_since
+        if gap_start is None and self._recovering:
+            gap_start = self._restored_last_seen()
+        gap_start = gap_start or timestamp
+        self._recovering = False
+        self._unavailable_since = None
+
+        changes: dict[str, Any] = {}
+        if self.cycle.mowing and activity in (_DOCKED, STATE_CHARGING):
+            self._stop_mowing(changes, gap_start, activity)
+        if self.cycle.charging and activity != STATE_CHARGING:
+            self._stop_charging(changes, gap_start, activity)
+        if activity == _MOWING:
+            self._ensure_mowing(changes, timestamp, activity)
+        elif activity == STATE_CHARGING:
+            self._ensure_charging(changes, timestamp, activity)
+        if self.cycle.stuck and activity in (_DOCKED, STATE_CHARGING):
+            self._release(changes, timestamp, activity)
+
+        if changes:
+            _LOGGER.debug(
+                "%s recovered as %s: %s",
+                self.coordinator.entry.title,
+                activity,
+                ", ".join(changes),
+            )
+            self._async_apply(changes)
+
+    def _restored_last_seen(self) -> datetime | None:
+        """Return when the restored cycle state was last stored, if known."""
+        last_states = restore_state.async_get(self.coordinator.hass).last_states
+        entity_ids = self.coordinator.entity_ids
+        return max(
+            (
+                stored.last_seen
+                for key in (KEY_START_MOWING_CYCLE, KEY_START_CHARGING_CYCLE)
+                if (entity_id := entity_ids.get(key)) is not None
+                and (stored := last_states.get(entity_id)) is not None
+            ),
+            default=None,
+        )
+
+    @callback
+    def _async_apply(self, changes: dict[str, Any]) -> None:
+        """Apply the changes, then log the closed sessions and fire the events.
+
+        The sessions are logged once the cycles are closed, so their listeners
+        never see a session that is both logged and still open.
+        """
+        self.coordinator.async_apply_cycle_changes(changes)
+        sessions, self._closed_sessions = self._closed_sessions, []
+        for session in sessions:
+            self.coordinator.async_record_session(session)
+        for key, event in (
+            (KEY_START_MOWING_CYCLE, EVENT_MOWING_STARTED),
+            (KEY_START_CHARGING_CYCLE, EVENT_CHARGING_STARTED),
+        ):
+            if (start := changes.get(key)) is not None:
+                self.coordinator.async_fire_event(event, {"start": start.isoformat()})
+
+    def _start_mowing(
+        self, changes: dict[str, Any], timestamp: datetime, new_state: str
+    ) -> None:
+        """Start a mowing cycle."""
+        changes[KEY_START_MOWING_CYCLE] = timestamp
+
+    def _ensure_mowing(
+        self, changes: dict[str, Any], timestamp: datetime, new_state: str
+    ) -> None:
+        """Start a mowing cycle unless one is open."""
+        if not self.cycle.mowing:
+            self._start_mowing(changes, timestamp, new_state)
+
+    def _stop_mowing(
+        self, changes: dict[str, Any], timestamp: datetime, new_state: str
+    ) -> None:
+        """Close the open mowing cycle and log its session."""
+        if not self.cycle.mowing:
+            return
+        changes[KEY_END_MOWING_CYCLE] = timestamp
+        self._closed_sessions.append(
+            RobbySession(
+                SESSION_MOWING,
+                self.cycle.mowing_start,
+                timestamp,
+                outcome=OUTCOME_STUCK if self.cycle.stuck else OUTCOME_COMPLETED,
+            )
+        )
+
+    def _start_charging(
+        self, changes: dict[str, Any], timestamp: datetime, new_state: str
+    ) -> None:
+        """Start a charging cycle."""
+        changes[KEY_START_CHARGING_CYCLE] = timestamp
+
+    def _ensure_charging(
+        self, changes: dict[str, Any], timestamp: datetime, new_state: str
+    ) -> None:
+        """Start a charging cycle unless one is open."""
+        if not self.cycle.charging:
+            self._start_charging(changes, timestamp, new_state)
+
+    def _stop_charging(
+        self, changes: dict[str, Any], timestamp: datetime, new_state: str
+    ) -> None:
+        """Close the charging cycle and log its session."""
+        changes[KEY_END_CHARGING_CYCLE] = timestamp
+        if not self.cycle.charging:
+            return
+        self._closed_sessions.append(
+            RobbySession(
+                SESSION_CHARGING,
+                self.cycle.charging_start,
+                timestamp,
+                energy=round(self.coordinator.energy.session_energy, 1),
+                outcome=OUTCOME_INTERRUPTED
+                if new_state == _MOWING
+                else OUTCOME_COMPLETED,
+            )
+        )
+
+    def _release(
+        self, changes: dict[str, Any], timestamp: datetime, new_state: str
+    ) -> None:
+        """Clear the stuck state."""
+        changes[KEY_STUCK] = False
+        changes[ATTR_STUCK_REASON] = None
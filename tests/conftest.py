@@ -0,0 +1,30 @@
+"""Fixtures for the Robby integration tests."""
+
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.robby.const import (
+    CONF_POWER_SENSOR,
+    CONF_SWITCH_SENSOR,
+    DOMAIN,
+)
+
+POWER_SENSOR = "sensor.robby_plug_power"
+SWITCH = "switch.robby_plug"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable the custom integrations in every test."""
+
+
+@pytest.fixture
+def mock_config_entry() -> MockConfigEntry:
+    """Return a Robby backed by a power sensor and a switch."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Robby",
+        data={CONF_POWER_SENSOR: POWER_SENSOR, CONF_SWITCH_SENSOR: SWITCH},
+    )
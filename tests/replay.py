@@ -0,0 +1,125 @@
+"""Replay recorded power and switch traces through the Robby integration.
+
+A trace is a CSV file with a header or a JSONL file. Every row has an
+``offset`` in seconds from the start of the trace and a ``power`` and/or
+``switch`` state, written as is to the backing entities. The first row is
+the state the entry is set up with.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.robby.const import CONF_POWER_SENSOR, CONF_SWITCH_SENSOR
+
+TRACES = Path(__file__).parent / "traces"
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayReport:
+    """Work done by the integration while replaying a trace."""
+
+    samples: int
+    setup_dropped_events: int
+    state_changes: int
+    elapsed: float
+    state_writes: int
+    service_calls: int
+    transitions: int
+
+    @property
+    def events_per_second(self) -> float:
+        """Return the state changes processed per second."""
+        return self.state_changes / self.elapsed if self.elapsed else float("inf")
+
+    @property
+    def state_writes_per_sample(self) -> float:
+        """Return the entity state writes per sample."""
+        return self.state_writes / self.samples if self.samples else 0.0
+
+    @property
+    def service_calls_per_transition(self) -> float:
+        """Return the service calls per change of the lawn mower state."""
+        return self.service_calls / self.transitions if self.transitions else 0.0
+
+
+def load_trace(path: Path) -> list[dict[str, Any]]:
+    """Load the samples of a CSV or JSONL trace, ordered by their offset."""
+    with path.open(encoding="utf-8") as file:
+        if path.suffix == ".jsonl":
+            rows = [json.loads(line) for line in file if line.strip()]
+        else:
+            rows = list(csv.DictReader(file))
+    return sorted(rows, key=lambda row: float(row["offset"]))
+
+
+def _set_sample(
+    hass: HomeAssistant, entry: MockConfigEntry, row: dict[str, Any]
+) -> int:
+    """Write a sample to the backing entities, return the state changes."""
+    changes = 0
+    for key, entity_id in (
+        ("power", entry.data[CONF_POWER_SENSOR]),
+        ("switch", entry.data[CONF_SWITCH_SENSOR]),
+    ):
+        if (value := row.get(key)) in (None, ""):
+            continue
+        state = hass.states.get(entity_id)
+        if state is None or state.state != str(value):
+            changes += 1
+        hass.states.async_set(entity_id, str(value))
+    return changes
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entry: MockConfigEntry,
+    rows: list[dict[str, Any]],
+    start: datetime,
+) -> ReplayReport:
+    """Set up the entry on the first row and replay the other rows in time."""
+    first, *samples = rows
+    freezer.move_to(start + timedelta(seconds=float(first["offset"])))
+    _set_sample(hass, entry, first)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    setup_dropped_events = entry.runtime_data.metrics.dropped_events
+
+    state_changes = 0
+    elapsed = 0.0
+    for row in samples:
+        freezer.move_to(start + timedelta(seconds=float(row["offset"])))
+        # Timers that are due before the sample, like a dwell timer, fire first.
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        started = time.perf_counter()
+        state_changes += _set_sample(hass, entry, row)
+        await hass.async_block_till_done()
+        elapsed += time.perf_counter() - started
+
+    metrics = entry.runtime_data.metrics
+    return ReplayReport(
+        samples=len(samples),
+        setup_dropped_events=setup_dropped_events,
+        state_changes=state_changes,
+        elapsed=elapsed,
+        state_writes=metrics.state_writes,
+        service_calls=metrics.service_calls,
+        transitions=sum(metrics.transitions.values()),
+    )
@@ -0,0 +1,84 @@
+"""Session anomaly detection tests of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.robby.anomaly import (
+    METRIC_CHARGE_ENERGY,
+    METRIC_MOWING_DURATION,
+    RobbyAnomalyDetector,
+)
+from custom_components.robby.const import ANOMALY_MIN_SESSIONS, ANOMALY_THRESHOLD
+from custom_components.robby.history import (
+    OUTCOME_COMPLETED,
+    OUTCOME_STUCK,
+    SESSION_CHARGING,
+    SESSION_MOWING,
+    RobbySession,
+)
+
+START = datetime(2026, 6, 1, 6, 0, tzinfo=UTC)
+
+
+def _mowing(seconds: float, outcome: str = OUTCOME_COMPLETED) -> RobbySession:
+    """Return a mowing session of the given duration."""
+    return RobbySession(
+        SESSION_MOWING, START, START + timedelta(seconds=seconds), outcome=outcome
+    )
+
+
+def _history() -> list[RobbySession]:
+    """Return normal mowing sessions of about an hour."""
+    return [_mowing(3540 + 120 * (index % 2)) for index in range(ANOMALY_MIN_SESSIONS)]
+
+
+def test_outlier_flagged_until_normal() -> None:
+    """Test that a deviating session is flagged until a normal one."""
+    detector = RobbyAnomalyDetector()
+    detector.seed(_history())
+
+    assert detector.check_session(_mowing(7200))
+    assert detector.anomalies[METRIC_MOWING_DURATION] >= ANOMALY_THRESHOLD
+    assert detector.check_session(_mowing(3600))
+    assert detector.anomalies == {}
+
+
+def test_too_few_sessions() -> None:
+    """Test that nothing is flagged before enough sessions are known."""
+    detector = RobbyAnomalyDetector()
+    detector.seed(_history()[:-1])
+
+    assert not detector.check_session(_mowing(7200))
+    assert detector.anomalies == {}
+
+
+def test_only_completed_sessions() -> None:
+    """Test that sessions that did not complete are neither checked nor learned."""
+    detector = RobbyAnomalyDetector()
+    detector.seed(_history())
+    count = detector.stats[METRIC_MOWING_DURATION].count
+
+    assert not detector.check_session(_mowing(7200, OUTCOME_STUCK))
+    assert detector.stats[METRIC_MOWING_DURATION].count == count
+
+
+def test_charge_energy() -> None:
+    """Test that the charged energy is tracked next to the duration."""
+    detector = RobbyAnomalyDetector()
+    detector.seed(
+        RobbySession(
+            SESSION_CHARGING,
+            START,
+            START + timedelta(minutes=45),
+            energy=10 + index % 2,
+        )
+        for index in range(ANOMALY_MIN_SESSIONS)
+    )
+
+    assert detector.check_session(
+        RobbySession(
+            SESSION_CHARGING, START, START + timedelta(minutes=45), energy=30
+        )
+    )
+    assert list(detector.anomalies) == [METRIC_CHARGE_ENERGY]
@@ -0,0 +1,93 @@
+"""Battery estimation tests of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+
+from custom_components.robby.battery import RobbyBatteryEstimator
+from custom_components.robby.const import (
+    BATTERY_RETURN_LEVEL,
+    BATTERY_TAPER_LEVEL,
+    STATE_CHARGING,
+)
+from custom_components.robby.energy import ChargingEnergyMeter
+from custom_components.robby.history import (
+    OUTCOME_INTERRUPTED,
+    SESSION_CHARGING,
+    SESSION_MOWING,
+    RobbySession,
+)
+
+START = datetime(2026, 6, 1, 6, 0, tzinfo=UTC)
+
+
+def _estimator() -> RobbyBatteryEstimator:
+    """Return an estimator that learned to charge 10 Wh and mow an hour."""
+    estimator = RobbyBatteryEstimator(ChargingEnergyMeter())
+    estimator.profile.add_sessions(
+        (
+            RobbySession(
+                SESSION_CHARGING, START, START + timedelta(minutes=45), energy=10
+            ),
+            RobbySession(SESSION_MOWING, START, START + timedelta(hours=1)),
+            # Interrupted sessions do not describe a full charge or drain.
+            RobbySession(
+                SESSION_CHARGING,
+                START,
+                START + timedelta(minutes=5),
+                energy=1,
+                outcome=OUTCOME_INTERRUPTED,
+            ),
+        )
+    )
+    return estimator
+
+
+def _update(
+    estimator: RobbyBatteryEstimator, activity: str, power: float, timestamp: float
+) -> None:
+    """Feed a sample to the energy meter and the estimator, like the coordinator."""
+    estimator.energy.update(power, timestamp, activity == STATE_CHARGING)
+    estimator.update(activity, power, timestamp)
+
+
+def test_profile() -> None:
+    """Test that the profile only learns from completed sessions."""
+    estimator = _estimator()
+    assert estimator.profile.charge_energy == 10
+    assert estimator.profile.mowing_time == 3600
+
+
+def test_charge_and_drain() -> None:
+    """Test a charge from the return level, a full dock and a drain."""
+    estimator = _estimator()
+
+    _update(estimator, LawnMowerActivity.MOWING, 1.0, 0)
+    assert estimator.level is None
+    # A Robby that comes back from mowing is at the return level.
+    _update(estimator, STATE_CHARGING, 20.0, 3600)
+    assert estimator.level == BATTERY_RETURN_LEVEL
+
+    # 5 Wh of the 10 Wh charge fills half of the range above the return level.
+    _update(estimator, STATE_CHARGING, 20.0, 3600 + 900)
+    assert estimator.level == pytest.approx(60)
+    assert estimator.time_to_full == pytest.approx(900)
+
+    # Once the charging power tapers off, the battery is at the taper level.
+    _update(estimator, STATE_CHARGING, 15.0, 3600 + 901)
+    assert estimator.level == BATTERY_TAPER_LEVEL
+
+    # Only the end of the charge makes the battery full.
+    _update(estimator, STATE_CHARGING, 2.0, 3600 + 2700)
+    assert estimator.level < 100
+    _update(estimator, LawnMowerActivity.DOCKED, 2.5, 3600 + 2710)
+    assert estimator.level == 100
+
+    # Half of the learned mowing time drains half of the range.
+    _update(estimator, LawnMowerActivity.MOWING, 1.0, 7200)
+    _update(estimator, LawnMowerActivity.MOWING, 1.0, 7200 + 1800)
+    assert estimator.level == pytest.approx(100 - (100 - BATTERY_RETURN_LEVEL) / 2)
@@ -0,0 +1,78 @@
+"""Power classifier tests of the Robby integration."""
+
+from __future__ import annotations
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+
+from custom_components.robby.classifier import ActivityClassifier, ClassifierConfig
+from custom_components.robby.const import STATE_CHARGING
+
+
+def test_hysteresis() -> None:
+    """Test that the band of the current activity is widened."""
+    classifier = ActivityClassifier(ClassifierConfig(sample_window=1, dwell_times={}))
+
+    for power, activity in (
+        (1.0, LawnMowerActivity.MOWING),
+        # Within the hysteresis above the mowing threshold.
+        (2.1, LawnMowerActivity.MOWING),
+        (2.3, LawnMowerActivity.DOCKED),
+        # Within the hysteresis below the mowing threshold.
+        (1.9, LawnMowerActivity.DOCKED),
+        (1.7, LawnMowerActivity.MOWING),
+        (2.5, LawnMowerActivity.DOCKED),
+        # Within the hysteresis above the charging threshold.
+        (3.1, LawnMowerActivity.DOCKED),
+        (3.3, STATE_CHARGING),
+        # Within the hysteresis below the charging threshold.
+        (2.9, STATE_CHARGING),
+        (2.7, LawnMowerActivity.DOCKED),
+        (0.0, LawnMowerActivity.ERROR),
+    ):
+        assert classifier.add_sample(power, 0) == activity, power
+
+
+def test_median_rejects_spike() -> None:
+    """Test that a single outlier does not change the activity."""
+    classifier = ActivityClassifier(ClassifierConfig(dwell_times={}))
+
+    for power in (2.5, 2.5, 1.0, 2.6):
+        assert classifier.add_sample(power, 0) == LawnMowerActivity.DOCKED
+
+
+def test_dwell_time() -> None:
+    """Test that an activity is adopted once it lasted its dwell time."""
+    classifier = ActivityClassifier(ClassifierConfig(sample_window=1))
+
+    assert classifier.add_sample(2.5, 0) == LawnMowerActivity.DOCKED
+    assert classifier.add_sample(1.0, 5) == LawnMowerActivity.DOCKED
+    assert classifier.pending == LawnMowerActivity.MOWING
+    assert classifier.next_evaluation == 15
+    assert classifier.evaluate(14) == LawnMowerActivity.DOCKED
+    assert classifier.evaluate(15) == LawnMowerActivity.MOWING
+    # The activity started when it was first seen.
+    assert classifier.activity_since == 5
+    assert classifier.pending is None
+
+
+def test_dwell_time_restarts_on_flicker() -> None:
+    """Test that returning to the current activity resets the dwell time."""
+    classifier = ActivityClassifier(ClassifierConfig(sample_window=1))
+
+    classifier.add_sample(2.5, 0)
+    classifier.add_sample(1.0, 5)
+    classifier.add_sample(2.5, 8)
+    assert classifier.pending is None
+    classifier.add_sample(1.0, 10)
+    assert classifier.evaluate(15) == LawnMowerActivity.DOCKED
+    assert classifier.evaluate(20) == LawnMowerActivity.MOWING
+
+
+def test_reconfigure_keeps_samples() -> None:
+    """Test that new thresholds apply to the recent samples."""
+    classifier = ActivityClassifier(ClassifierConfig(dwell_times={}))
+    for power in (2.5, 2.5, 2.5):
+        classifier.add_sample(power, 0)
+
+    classifier.reconfigure(ClassifierConfig(mowing_max_power=3.0, dwell_times={}))
+    assert classifier.evaluate(0) == LawnMowerActivity.MOWING
@@ -0,0 +1,89 @@
+"""Config flow tests of the Robby integration."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant import config_entries
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.robby.const import (
+    CONF_CHARGING_MIN_POWER,
+    CONF_HYSTERESIS,
+    CONF_MOWING_MAX_POWER,
+    CONF_POWER_SENSOR,
+    CONF_SAMPLE_WINDOW,
+    CONF_SWITCH_SENSOR,
+    DOMAIN,
+)
+
+from .conftest import POWER_SENSOR, SWITCH
+
+
+async def test_entities_already_configured(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that a power sensor backs at most one Robby."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.MENU
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "entities"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "entities"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_POWER_SENSOR: POWER_SENSOR, CONF_SWITCH_SENSOR: "switch.other_plug"},
+    )
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_options_flow(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that the options are validated and applied without a reload."""
+    hass.states.async_set(POWER_SENSOR, "2.5")
+    hass.states.async_set(SWITCH, STATE_ON)
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_MOWING_MAX_POWER: 3.0, CONF_CHARGING_MIN_POWER: 2.0},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_CHARGING_MIN_POWER: "invalid_thresholds"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_MOWING_MAX_POWER: 1.5,
+            CONF_CHARGING_MIN_POWER: 4.0,
+            CONF_HYSTERESIS: 0.5,
+            CONF_SAMPLE_WINDOW: 5,
+        },
+    )
+    await hass.async_block_till_done()
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options[CONF_SAMPLE_WINDOW] == 5
+
+    classifier = mock_config_entry.runtime_data.classifier
+    assert classifier.config.mowing_max_power == 1.5
+    assert classifier.config.charging_min_power == 4.0
+    assert classifier.config.sample_window == 5
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
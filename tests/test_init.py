@@ -0,0 +1,52 @@
+"""Setup and unload tests of the Robby integration."""
+
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.robby.coordinator import RobbyCoordinator
+
+from .conftest import POWER_SENSOR, SWITCH
+
+RELOADS = 10
+
+
+async def test_reload_keeps_listeners_constant(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that reloads neither leak listeners nor repeat the work per event."""
+    hass.states.async_set(POWER_SENSOR, "2.5")
+    hass.states.async_set(SWITCH, STATE_ON)
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinators: list[RobbyCoordinator] = [mock_config_entry.runtime_data]
+    listener_counts = coordinators[0].listener_counts()
+    bus_listeners = hass.bus.async_listeners()
+    for reload in range(RELOADS):
+        assert await hass.config_entries.async_reload(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data
+        coordinators.append(coordinator)
+        assert coordinator.listener_counts() == listener_counts
+        assert hass.bus.async_listeners() == bus_listeners
+
+        # A docked power sample is handled once, by the current coordinator.
+        handled = sum(c.metrics.events[POWER_SENSOR] for c in coordinators)
+        hass.states.async_set(POWER_SENSOR, f"{2.6 + reload % 2 / 10:.1f}")
+        await hass.async_block_till_done()
+        assert sum(c.metrics.events[POWER_SENSOR] for c in coordinators) == (
+            handled + 1
+        )
+        assert coordinator.metrics.events == {POWER_SENSOR: 1}
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert "left listeners behind" not in caplog.text
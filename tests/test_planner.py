@@ -0,0 +1,172 @@
+"""Mowing planner tests of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.robby.const import (
+    CONF_POWER_SENSOR,
+    CONF_RAIN_SENSOR,
+    CONF_SWITCH_SENSOR,
+    CONF_WEEKLY_MOWING_TIME,
+    CONF_WINDOW_END,
+    CONF_WINDOW_START,
+    DOMAIN,
+)
+from custom_components.robby.history import SESSION_MOWING, RobbySession
+from custom_components.robby.planner import (
+    BLOCKED_RAIN,
+    BLOCKED_TARGET_REACHED,
+    MowingWindow,
+    learn_weekly_mowing_time,
+)
+
+from .conftest import POWER_SENSOR, SWITCH
+
+START = datetime(2026, 6, 1, 6, 0, tzinfo=UTC)
+RAIN_SENSOR = "binary_sensor.rain"
+
+
+def _mowing(start: datetime, hours: float) -> RobbySession:
+    """Return a mowing session of the given number of hours."""
+    return RobbySession(SESSION_MOWING, start, start + timedelta(hours=hours))
+
+
+async def _async_sample(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, power: str, seconds: float
+) -> None:
+    """Move the time, fire the due timers and write a power sample."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    hass.states.async_set(POWER_SENSOR, power)
+    await hass.async_block_till_done()
+
+
+def test_learn_weekly_mowing_time() -> None:
+    """Test the average mowing time per week of the history."""
+    # Less than a week of history is not trusted.
+    assert learn_weekly_mowing_time([_mowing(START, 1)]) is None
+    assert learn_weekly_mowing_time([]) is None
+
+    # Two weeks with one and two hours of mowing.
+    sessions = [
+        _mowing(START, 1),
+        _mowing(START + timedelta(weeks=2, hours=-2), 2),
+    ]
+    assert learn_weekly_mowing_time(sessions) == 1.5 * 3600
+    # A week that reached the target keeps the target.
+    assert learn_weekly_mowing_time(sessions, 1.75 * 3600) == 1.75 * 3600
+    # A target that was never reached is not kept.
+    assert learn_weekly_mowing_time(sessions, 3 * 3600) == 1.5 * 3600
+
+
+async def test_plan_windows(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the planned window around its boundaries and in the rain."""
+    time_zone = dt_util.get_default_time_zone()
+    today = datetime(2026, 6, 1, tzinfo=time_zone)
+    tomorrow = today + timedelta(days=1)
+    freezer.move_to(today.replace(hour=8))
+    hass.states.async_set(POWER_SENSOR, "2.5")
+    hass.states.async_set(SWITCH, STATE_ON)
+    hass.states.async_set(RAIN_SENSOR, STATE_OFF)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Robby",
+        data={CONF_POWER_SENSOR: POWER_SENSOR, CONF_SWITCH_SENSOR: SWITCH},
+        options={
+            CONF_WINDOW_START: "10:00:00",
+            CONF_WINDOW_END: "18:00:00",
+            CONF_RAIN_SENSOR: RAIN_SENSOR,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    planner = entry.runtime_data.planner
+
+    window = MowingWindow(today.replace(hour=10), today.replace(hour=18))
+    assert planner.window == window
+    assert planner.blocked is None
+    assert today.replace(hour=8) not in window
+    assert today.replace(hour=10) in window
+    assert today.replace(hour=18) not in window
+
+    # Rain blocks the window of today.
+    hass.states.async_set(RAIN_SENSOR, STATE_ON)
+    await hass.async_block_till_done()
+    assert planner.blocked == BLOCKED_RAIN
+    assert planner.window == MowingWindow(
+        tomorrow.replace(hour=10), tomorrow.replace(hour=18)
+    )
+    hass.states.async_set(RAIN_SENSOR, STATE_OFF)
+    await hass.async_block_till_done()
+    assert planner.window == window
+
+    # At the end of the window, the window of tomorrow is planned.
+    freezer.move_to(today.replace(hour=18))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert planner.window == MowingWindow(
+        tomorrow.replace(hour=10), tomorrow.replace(hour=18)
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_closed_session_counted_once(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that a closed session below the target does not block mowing."""
+    freezer.move_to(START)
+    hass.states.async_set(POWER_SENSOR, "2.5")
+    hass.states.async_set(SWITCH, STATE_ON)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Robby",
+        data={CONF_POWER_SENSOR: POWER_SENSOR, CONF_SWITCH_SENSOR: SWITCH},
+        options={CONF_WEEKLY_MOWING_TIME: 1},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data
+    planner = coordinator.planner
+
+    blocked: list[str | None] = []
+    remove_listener = planner.async_add_listener(
+        lambda: blocked.append(planner.blocked)
+    )
+
+    for power in ("0.8", "0.9", "0.8", "0.9"):
+        await _async_sample(hass, freezer, power, 5)
+    assert coordinator.cycle.mowing
+    # Mow for about 40 minutes, then charge.
+    await _async_sample(hass, freezer, "0.8", 2400)
+    for power in ("12.1", "12.3", "12.1", "12.3"):
+        await _async_sample(hass, freezer, power, 5)
+    assert not coordinator.cycle.mowing
+
+    mowed = coordinator.aggregates.week.mowing_time
+    assert 2400 < mowed < 3600
+    assert BLOCKED_TARGET_REACHED not in blocked
+    assert planner.blocked is None
+
+    remove_listener()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
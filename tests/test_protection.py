@@ -0,0 +1,91 @@
+"""Smart plug protection tests of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from homeassistant.const import SERVICE_TURN_OFF, SERVICE_TURN_ON, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.robby.const import (
+    CONF_IDLE_CUT_TIME,
+    CONF_POWER_CUT,
+    CONF_POWER_SENSOR,
+    CONF_SWITCH_SENSOR,
+    CONF_WINDOW_END,
+    CONF_WINDOW_START,
+    DOMAIN,
+    POWER_RESTORE_LEAD,
+)
+
+from .conftest import POWER_SENSOR, SWITCH
+
+
+async def _async_move_to(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, moment: datetime
+) -> None:
+    """Move the time and run the timers and switch calls that are due."""
+    freezer.move_to(moment)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_cut_waits_for_window_and_restores(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that an idle dock is cut after the window and restored before."""
+    today = datetime(2026, 6, 1, tzinfo=dt_util.get_default_time_zone())
+    tomorrow = today + timedelta(days=1)
+    freezer.move_to(today.replace(hour=9, minute=50))
+    hass.states.async_set(POWER_SENSOR, "2.5")
+    hass.states.async_set(SWITCH, STATE_ON)
+    turn_off = async_mock_service(hass, "homeassistant", SERVICE_TURN_OFF)
+    turn_on = async_mock_service(hass, "homeassistant", SERVICE_TURN_ON)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Robby",
+        data={CONF_POWER_SENSOR: POWER_SENSOR, CONF_SWITCH_SENSOR: SWITCH},
+        options={
+            CONF_POWER_CUT: True,
+            CONF_IDLE_CUT_TIME: 30,
+            CONF_WINDOW_START: "10:00:00",
+            CONF_WINDOW_END: "18:00:00",
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    protection = entry.runtime_data.protection
+
+    # The idle time ends at 10:20, within the window, so the cut waits.
+    await _async_move_to(hass, freezer, today.replace(hour=10, minute=21))
+    assert not protection.cut
+    assert not turn_off
+
+    await _async_move_to(hass, freezer, today.replace(hour=18))
+    assert protection.cut
+    assert len(turn_off) == 1
+    assert turn_off[0].data == {"entity_id": SWITCH}
+    hass.states.async_set(SWITCH, STATE_OFF)
+    await hass.async_block_till_done()
+
+    # The power is restored shortly before the window of tomorrow.
+    restore = tomorrow.replace(hour=10) - timedelta(seconds=POWER_RESTORE_LEAD)
+    await _async_move_to(hass, freezer, restore - timedelta(seconds=1))
+    assert not turn_on
+    await _async_move_to(hass, freezer, restore)
+    assert not protection.cut
+    assert len(turn_on) == 1
+    assert turn_on[0].data == {"entity_id": SWITCH}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
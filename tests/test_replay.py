@@ -0,0 +1,80 @@
+"""Trace replay tests of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.robby.const import (
+    KEY_END_CHARGING_CYCLE,
+    KEY_END_MOWING_CYCLE,
+    KEY_LAWN_MOWER,
+    KEY_START_CHARGING_CYCLE,
+    KEY_START_MOWING_CYCLE,
+)
+
+from .conftest import POWER_SENSOR
+from .replay import TRACES, async_replay, load_trace
+
+START = datetime(2026, 6, 1, 6, 0, tzinfo=UTC)
+
+
+async def test_replay_mowing_cycle(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test a docked, mowing, charging and docked trace with a power gap."""
+    rows = load_trace(TRACES / "mowing_cycle.csv")
+    report = await async_replay(hass, freezer, mock_config_entry, rows, START)
+    coordinator = mock_config_entry.runtime_data
+
+    # Activities are adopted after two samples and the dwell time of 10 s.
+    for key, offset in (
+        (KEY_START_MOWING_CYCLE, 75),
+        (KEY_END_MOWING_CYCLE, 315),
+        (KEY_START_CHARGING_CYCLE, 315),
+        (KEY_END_CHARGING_CYCLE, 615),
+    ):
+        state = hass.states.get(coordinator.entity_ids[key])
+        assert state is not None
+        assert dt_util.parse_datetime(state.state) == START + timedelta(
+            seconds=offset
+        )
+    state = hass.states.get(coordinator.entity_ids[KEY_LAWN_MOWER])
+    assert state is not None
+    assert state.state == LawnMowerActivity.DOCKED
+
+    metrics = coordinator.metrics.as_dict()
+    # Catching up on the unchanged states at setup is not a dropped event.
+    assert report.setup_dropped_events == 0
+    # Every state change is processed once, and only the unknown power right
+    # after the unavailable one has no effect.
+    assert metrics["events"] == {POWER_SENSOR: report.state_changes}
+    assert metrics["dropped_events"] == 1
+    assert metrics["throttled_events"] == 0
+    assert metrics["transitions"] == {
+        "docked->mowing": 1,
+        "mowing->charging": 1,
+        "charging->unavailable": 1,
+        "unavailable->charging": 1,
+        "charging->docked": 1,
+    }
+    assert metrics["stuck_detections"] == {}
+    assert report.service_calls_per_transition == 0
+    # No sample writes an entity more than once.
+    entities = er.async_entries_for_config_entry(
+        er.async_get(hass), mock_config_entry.entry_id
+    )
+    assert report.state_writes_per_sample <= len(entities)
+    assert report.events_per_second > 0
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,69 @@
+"""Simulator tests of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.robby.const import (
+    CONF_POWER_SENSOR,
+    CONF_SIMULATOR,
+    CONF_SWITCH_SENSOR,
+    DOMAIN,
+)
+
+SIMULATED_POWER = "sensor.robby_simulator_power"
+SIMULATED_SWITCH = "switch.robby_simulator_switch"
+
+
+async def test_switch_cuts_simulated_power(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test that the simulated power follows the simulated switch."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Robby simulator",
+        data={
+            CONF_POWER_SENSOR: SIMULATED_POWER,
+            CONF_SWITCH_SENSOR: SIMULATED_SWITCH,
+            CONF_SIMULATOR: {},
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SIMULATED_SWITCH)
+    assert state is not None
+    assert state.state == STATE_ON
+    state = hass.states.get(SIMULATED_POWER)
+    assert state is not None
+    assert float(state.state) > 0
+    assert entry.runtime_data.data.switch_on
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: SIMULATED_SWITCH},
+        blocking=True,
+    )
+    freezer.tick(timedelta(seconds=2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SIMULATED_POWER)
+    assert state is not None
+    assert float(state.state) == 0
+    assert not entry.runtime_data.data.switch_on
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,152 @@
+"""Long-term statistics tests of the Robby integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import get_last_statistics
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant, State
+
+from custom_components.robby.const import KEY_LAWN_MOWER, STATE_CHARGING
+from custom_components.robby.history import (
+    SESSION_CHARGING,
+    SESSION_MOWING,
+    RobbySession,
+)
+from custom_components.robby.statistics_import import (
+    STAT_MOWING_SESSIONS,
+    STAT_MOWING_TIME,
+    RobbyStatistics,
+    reconstruct_sessions,
+)
+
+from .conftest import POWER_SENSOR, SWITCH
+
+START = datetime(2026, 6, 1, 6, 0, tzinfo=UTC)
+
+
+def _at(minutes: float) -> datetime:
+    """Return the moment a number of minutes after the start."""
+    return START + timedelta(minutes=minutes)
+
+
+def test_reconstruct_sessions() -> None:
+    """Test that sessions are reconstructed like the cycle tracker closes them."""
+    states = [
+        State("lawn_mower.robby", state, last_changed=_at(minutes))
+        for minutes, state in (
+            (0, LawnMowerActivity.DOCKED),
+            (10, LawnMowerActivity.MOWING),
+            # An error does not end the mowing session.
+            (20, LawnMowerActivity.ERROR),
+            (25, LawnMowerActivity.MOWING),
+            (60, STATE_CHARGING),
+            # A session that ends in a gap is closed when the gap started.
+            (70, STATE_UNAVAILABLE),
+            (90, LawnMowerActivity.DOCKED),
+        )
+    ]
+
+    assert reconstruct_sessions(states) == [
+        RobbySession(SESSION_MOWING, _at(10), _at(60)),
+        RobbySession(SESSION_CHARGING, _at(60), _at(70)),
+    ]
+
+
+async def _async_get_sum(
+    hass: HomeAssistant, statistics: RobbyStatistics, key: str
+) -> float:
+    """Return the last sum of a statistic."""
+    statistic_id = statistics.metadata[key]["statistic_id"]
+    rows = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"sum"}
+    )
+    return rows[statistic_id][0]["sum"]
+
+
+async def test_backfill(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that the statistics are backfilled from the recorder history."""
+    freezer.move_to(START)
+    hass.states.async_set(POWER_SENSOR, "2.5")
+    hass.states.async_set(SWITCH, STATE_ON)
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    entity_id = mock_config_entry.runtime_data.entity_ids[KEY_LAWN_MOWER]
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # A session mowed before any statistics were written.
+    for minutes, state in (
+        (60, LawnMowerActivity.MOWING),
+        (90, LawnMowerActivity.DOCKED),
+    ):
+        freezer.move_to(_at(minutes))
+        hass.states.async_set(entity_id, state)
+    await async_wait_recording_done(hass)
+
+    freezer.move_to(_at(120))
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    await async_wait_recording_done(hass)
+
+    statistics = mock_config_entry.runtime_data.statistics
+    assert await _async_get_sum(hass, statistics, STAT_MOWING_TIME) == 0.5
+    assert await _async_get_sum(hass, statistics, STAT_MOWING_SESSIONS) == 1
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_session_closed_while_loading_written_on_unload(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that an unload waits for the load and writes the queued sessions."""
+    freezer.move_to(START)
+    hass.states.async_set(POWER_SENSOR, "2.5")
+    hass.states.async_set(SWITCH, STATE_ON)
+    backfilled = asyncio.Event()
+
+    async def _async_reconstruct(
+        statistics: RobbyStatistics, cutoff: datetime
+    ) -> list[RobbySession]:
+        await backfilled.wait()
+        return []
+
+    with patch.object(RobbyStatistics, "_async_reconstruct", _async_reconstruct):
+        mock_config_entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        statistics = mock_config_entry.runtime_data.statistics
+        statistics.async_add_session(
+            RobbySession(SESSION_MOWING, START - timedelta(minutes=30), START)
+        )
+
+        unload = hass.async_create_task(
+            hass.config_entries.async_unload(mock_config_entry.entry_id)
+        )
+        await asyncio.sleep(0)
+        backfilled.set()
+        assert await unload
+    await async_wait_recording_done(hass)
+
+    assert await _async_get_sum(hass, statistics, STAT_MOWING_TIME) == 0.5
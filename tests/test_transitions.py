@@ -0,0 +1,148 @@
+"""Cycle tracking tests of the Robby integration."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    mock_restore_cache,
+)
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from custom_components.robby.const import (
+    KEY_END_MOWING_CYCLE,
+    KEY_START_MOWING_CYCLE,
+    STATE_CHARGING,
+)
+from custom_components.robby.transitions import (
+    ACTION_ENSURE_CHARGING,
+    ACTION_RELEASE,
+    ACTION_START_MOWING,
+    ACTION_STOP_CHARGING,
+    ACTION_STOP_MOWING,
+    TRANSITION_TABLE,
+    compile_transitions,
+)
+
+from .conftest import POWER_SENSOR, SWITCH
+from .replay import async_replay
+
+START = datetime(2026, 6, 1, 6, 0, tzinfo=UTC)
+
+
+def test_compile_transitions() -> None:
+    """Test that every rule of the table expands to its own lookups."""
+    transitions = compile_transitions(TRANSITION_TABLE)
+
+    # No two rules claim the same change of activity.
+    assert len(transitions) == sum(
+        len(old_activities) * len(new_activities)
+        for old_activities, new_activities, _ in TRANSITION_TABLE
+    )
+    assert transitions[LawnMowerActivity.MOWING, LawnMowerActivity.DOCKED] == (
+        ACTION_STOP_MOWING,
+        ACTION_RELEASE,
+    )
+    assert transitions[LawnMowerActivity.ERROR, STATE_CHARGING] == (
+        ACTION_STOP_MOWING,
+        ACTION_RELEASE,
+        ACTION_ENSURE_CHARGING,
+    )
+    assert transitions[STATE_CHARGING, LawnMowerActivity.MOWING] == (
+        ACTION_STOP_CHARGING,
+        ACTION_START_MOWING,
+    )
+    # An error does not end the mowing cycle.
+    assert (LawnMowerActivity.MOWING, LawnMowerActivity.ERROR) not in transitions
+
+
+async def test_error_keeps_mowing_cycle(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that mowing after an error continues the same cycle."""
+    rows = [
+        {"offset": offset, "power": power, "switch": STATE_ON}
+        for offset, power in (
+            (0, "2.5"),
+            (5, "0.8"),
+            (10, "0.9"),
+            (15, "0.8"),
+            (20, "0.9"),
+            (25, "0"),
+            (30, "0"),
+            (35, "0"),
+            (40, "0"),
+            (45, "0.8"),
+            (50, "0.9"),
+            (55, "0.8"),
+            (60, "0.9"),
+            (65, "12.1"),
+            (70, "12.3"),
+            (75, "12.1"),
+            (80, "12.3"),
+        )
+    ]
+    await async_replay(hass, freezer, mock_config_entry, rows, START)
+    coordinator = mock_config_entry.runtime_data
+
+    assert coordinator.metrics.transitions == {
+        "docked->mowing": 1,
+        "mowing->error": 1,
+        "error->mowing": 1,
+        "mowing->charging": 1,
+    }
+    for key, offset in ((KEY_START_MOWING_CYCLE, 20), (KEY_END_MOWING_CYCLE, 80)):
+        state = hass.states.get(coordinator.entity_ids[key])
+        assert state is not None
+        assert dt_util.parse_datetime(state.state) == START + timedelta(
+            seconds=offset
+        )
+    assert coordinator.aggregates.week.mowing_sessions == 1
+    assert coordinator.aggregates.week.mowing_time == 60
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_restored_cycle_closed_when_last_seen(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test that a cycle open at shutdown is closed when it was last seen."""
+    freezer.move_to(START)
+    mock_restore_cache(
+        hass,
+        (
+            State(
+                "datetime.robby_start_mowing_cycle",
+                (START - timedelta(minutes=30)).isoformat(),
+            ),
+        ),
+    )
+
+    # The Robby docked while Home Assistant was stopped.
+    freezer.move_to(START + timedelta(hours=2))
+    hass.states.async_set(POWER_SENSOR, "2.5")
+    hass.states.async_set(SWITCH, STATE_ON)
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+
+    assert not coordinator.cycle.mowing
+    state = hass.states.get(coordinator.entity_ids[KEY_END_MOWING_CYCLE])
+    assert state is not None
+    assert dt_util.parse_datetime(state.state) == START
+    assert coordinator.aggregates.week.mowing_time == 1800
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()